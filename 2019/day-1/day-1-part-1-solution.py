@@ -1,15 +1,38 @@
 # --- Day 1: The Tyranny of the Rocket Equation ---
+from typing import Iterator
+import numpy as np
 
+# the size (in bytes) of the chunks in which the input is read, so that manifests
+# larger than the memory can be streamed through
+CHUNK_SIZE = 2 ** 24
 
-with open("input", "r") as input_data:
-    # read entries; each entry is a separate line in input
-    module_mass = input_data.read().split("\n")[:-1]  # remove the last entry, just a blank due to the last \n
 
-    # convert to integers
-    module_mass = [int(i) for i in module_mass]
+def read_module_masses(path : str, chunk_size : int=None) -> Iterator[np.ndarray]:
+    """Reads the module masses (one per line) into arrays, either all in one array
+    or, if `chunk_size` is given, one array per chunk of about that many bytes.
+    """
+    with open(path, "rb") as input_data:
+        if chunk_size is None:
+            yield np.array(input_data.read().split(), dtype=np.int64)
+            return
 
-# calculate the fuel requirement for each module based on its mass
-fuel_requirements = [mass//3 - 2 for mass in module_mass]
+        remainder = b""
+        while chunk := input_data.read(chunk_size):
+            # a chunk may end in the middle of a line, which is kept for the next chunk
+            chunk = remainder + chunk
+            last_line_end = chunk.rfind(b"\n") + 1
+            remainder = chunk[last_line_end:]
+            if last_line_end:
+                yield np.array(chunk[:last_line_end].split(), dtype=np.int64)
+        if remainder.strip():
+            yield np.array(remainder.split(), dtype=np.int64)
+
+
+
+# calculate the fuel requirement for each module based on its mass, for a whole
+# chunk of modules at a time
+fuel_requirements = (int((module_mass // 3 - 2).sum())
+                     for module_mass in read_module_masses(path="input", chunk_size=CHUNK_SIZE))
 
 # the answer to the puzzle is the sum of the fuel requirements
 answer = sum(fuel_requirements)
@@ -1,25 +1,54 @@
 # --- Day 1: The Tyranny of the Rocket Equation ---
+from typing import Iterator
+import numpy as np
 
+# the size (in bytes) of the chunks in which the input is read, so that manifests
+# larger than the memory can be streamed through
+CHUNK_SIZE = 2 ** 24
 
-def get_fuel_requirement(mass : int) -> int:
-    """Gets the recursive fuel requirement for a given input mass (i.e. the fuel
-    required to transport the input mass will also need to be transported, thus
-    requiring additional fuel).
+
+def read_module_masses(path : str, chunk_size : int=None) -> Iterator[np.ndarray]:
+    """Reads the module masses (one per line) into arrays, either all in one array
+    or, if `chunk_size` is given, one array per chunk of about that many bytes.
     """
-    fuel_weight = mass//3 - 2
-    if fuel_weight >= 9:  # anything less than 9 will give a negative number
-        fuel_weight += get_fuel_requirement(mass=fuel_weight)
-    return fuel_weight
+    with open(path, "rb") as input_data:
+        if chunk_size is None:
+            yield np.array(input_data.read().split(), dtype=np.int64)
+            return
+
+        remainder = b""
+        while chunk := input_data.read(chunk_size):
+            # a chunk may end in the middle of a line, which is kept for the next chunk
+            chunk = remainder + chunk
+            last_line_end = chunk.rfind(b"\n") + 1
+            remainder = chunk[last_line_end:]
+            if last_line_end:
+                yield np.array(chunk[:last_line_end].split(), dtype=np.int64)
+        if remainder.strip():
+            yield np.array(remainder.split(), dtype=np.int64)
+
 
-with open("input", "r") as input_data:
-    # read entries; each entry is a separate line in input
-    module_mass = input_data.read().split("\n")[:-1]  # remove the last entry, just a blank due to the last \n
 
-    # convert to integers
-    module_mass = [int(i) for i in module_mass]
+def get_fuel_requirement(module_mass : np.ndarray) -> int:
+    """Gets the total recursive fuel requirement for an array of module masses (i.e.
+    the fuel required to transport each module will also need to be transported,
+    thus requiring additional fuel). The recurrence is applied to the whole array at
+    once, dropping the modules whose last fuel needs no more fuel (i.e. whose fuel
+    requirement is no longer positive) at each step.
+    """
+    total_fuel_weight = 0
+    fuel_weight = module_mass // 3 - 2
+    while len(fuel_weight):
+        fuel_weight = fuel_weight[fuel_weight > 0]
+        total_fuel_weight += int(fuel_weight.sum())
+        fuel_weight = fuel_weight // 3 - 2
+    return total_fuel_weight
+
 
-# calculate the fuel requirement for each module based on its mass
-fuel_requirements = [get_fuel_requirement(mass=mass) for mass in module_mass]
+# calculate the fuel requirement for each module based on its mass, for a whole
+# chunk of modules at a time
+fuel_requirements = (get_fuel_requirement(module_mass=module_mass)
+                     for module_mass in read_module_masses(path="input", chunk_size=CHUNK_SIZE))
 
 # the answer to the puzzle is the sum of the recursive fuel requirements
 answer = sum(fuel_requirements)
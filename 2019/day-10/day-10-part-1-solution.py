@@ -1,16 +1,9 @@
 # --- Day 10: Monitoring Station ---
 from typing import Tuple
-import math
+import numpy as np
 
-
-def reduce_asteroid_positions(x : int, y : int) -> Tuple[int, int]:
-    """Reduces the asteroid positions using their greatest common divisor.
-    """
-    try:
-        gcd = math.gcd(x, y)  # the greatest common divisor
-        return x//gcd, y//gcd
-    except ZeroDivisionError:  # only occurs when both x and y are 0 (i.e. for the relative origin)
-        return 0, 0
+# the largest number of relative positions handled at once when finding the best position
+MAX_TILE_SIZE = 2 ** 22
 
 
 def get_asteroid_coordinates(asteroid_map : list) -> list:
@@ -27,27 +20,43 @@ def get_asteroid_coordinates(asteroid_map : list) -> list:
 def find_best_position(coordinates : list) -> Tuple[tuple, int]:
     """Finds the best asteroid on which to build a monitoring station, based on
     how many asteroids can be detected from that position using a direct line of sight.
-    """
-    max_asteroids_detected = 0
-    best_position = (0, 0)  # placeholder
-
-    # loop over all the asteroid coordinates
-    for x_ref, y_ref in coordinates:
 
-        # make all positions now relative to `asteroid_ref`
-        asteroids_relative_positions = [(x-x_ref, y-y_ref) for x, y in coordinates]
-
-        # redefine all relative positions in terms of their lowest common multiple
-        asteroids_reduced_positions = [reduce_asteroid_positions(x, y) for x, y in asteroids_relative_positions]
-
-        # the number of asteroids detected should be the set of the reduced positions
-        n_asteroids = len(set(asteroids_reduced_positions)) - 1  # don't forget to subtract 1 for the origin
-
-        if n_asteroids > max_asteroids_detected:
-            max_asteroids_detected = n_asteroids
-            best_position = (x_ref, y_ref)
+    An asteroid hides the ones behind it in exactly the same direction, so the
+    number of asteroids detected from a position is the number of different
+    directions to the other asteroids, once each relative position is reduced by
+    the greatest common divisor of its coordinates. The relative positions from a
+    tile of positions at a time are reduced as arrays, and each direction is packed
+    into a single integer so that the directions can be counted by sorting them.
+    """
+    positions = np.array(coordinates, dtype=np.int64)
+    n_asteroids = len(positions)
+
+    # reduced directions range from -span to span in each coordinate, which is
+    # packed as (dx + span) * (2 * span + 1) + (dy + span)
+    span = int((positions.max(axis=0) - positions.min(axis=0)).max())
+    width = 2 * span + 1
+
+    # keep the arrays of each tile to about MAX_TILE_SIZE relative positions
+    tile_size = max(1, MAX_TILE_SIZE // n_asteroids)
+    n_asteroids_detected = np.empty(n_asteroids, dtype=np.int64)
+    for start in range(0, n_asteroids, tile_size):
+        # make all positions now relative to each asteroid in the tile
+        relative_positions = positions[np.newaxis, :, :] - positions[start:start+tile_size, np.newaxis, :]
+        x, y = relative_positions[..., 0], relative_positions[..., 1]
+
+        # redefine all relative positions in terms of their greatest common divisor
+        gcd = np.gcd(x, y)
+        gcd[gcd == 0] = 1  # only for the relative origin, which stays (0, 0)
+        directions = (x // gcd + span) * width + (y // gcd + span)
+
+        # the number of asteroids detected is the number of different directions
+        directions.sort(axis=1)
+        n_directions = 1 + (directions[:, 1:] != directions[:, :-1]).sum(axis=1)
+        n_asteroids_detected[start:start+tile_size] = n_directions - 1  # don't forget to subtract 1 for the origin
+
+    best_idx = int(n_asteroids_detected.argmax())
+    return tuple(coordinates[best_idx]), int(n_asteroids_detected[best_idx])
 
-    return best_position, max_asteroids_detected
 
 def main():
     with open("input", "r") as input_data:
@@ -1,7 +1,11 @@
 # --- Day 10: Monitoring Station ---
 from typing import Tuple
-from operator import itemgetter
+from functools import cmp_to_key
 import math
+import numpy as np
+
+# the largest number of relative positions handled at once when finding the best position
+MAX_TILE_SIZE = 2 ** 22
 
 
 def reduce_asteroid_positions(x : int, y : int) -> Tuple[int, int]:
@@ -28,109 +32,97 @@ def get_asteroid_coordinates(asteroid_map : list) -> list:
 def find_best_position(coordinates : list) -> Tuple[tuple, int]:
     """Finds the best asteroid on which to build a monitoring station, based on
     how many asteroids can be detected from that position using a direct line of sight.
-    """
-    max_asteroids_detected = 0
-    best_position = (0, 0)  # placeholder
 
-    # loop over all the asteroid coordinates
-    for x_ref, y_ref in coordinates:
+    An asteroid hides the ones behind it in exactly the same direction, so the
+    number of asteroids detected from a position is the number of different
+    directions to the other asteroids, once each relative position is reduced by
+    the greatest common divisor of its coordinates. The relative positions from a
+    tile of positions at a time are reduced as arrays, and each direction is packed
+    into a single integer so that the directions can be counted by sorting them.
+    """
+    positions = np.array(coordinates, dtype=np.int64)
+    n_asteroids = len(positions)
 
-        # make all positions now relative to `asteroid_ref`
-        asteroids_relative_positions = [(x-x_ref, y-y_ref) for x, y in coordinates]
+    # reduced directions range from -span to span in each coordinate, which is
+    # packed as (dx + span) * (2 * span + 1) + (dy + span)
+    span = int((positions.max(axis=0) - positions.min(axis=0)).max())
+    width = 2 * span + 1
 
-        # redefine all relative positions in terms of their lowest common multiple
-        asteroids_reduced_positions = [reduce_asteroid_positions(x, y) for x, y in asteroids_relative_positions]
+    # keep the arrays of each tile to about MAX_TILE_SIZE relative positions
+    tile_size = max(1, MAX_TILE_SIZE // n_asteroids)
+    n_asteroids_detected = np.empty(n_asteroids, dtype=np.int64)
+    for start in range(0, n_asteroids, tile_size):
+        # make all positions now relative to each asteroid in the tile
+        relative_positions = positions[np.newaxis, :, :] - positions[start:start+tile_size, np.newaxis, :]
+        x, y = relative_positions[..., 0], relative_positions[..., 1]
 
-        # the number of asteroids detected should be the set of the reduced positions
-        n_asteroids = len(set(asteroids_reduced_positions)) - 1  # don't forget to subtract 1 for the origin
+        # redefine all relative positions in terms of their greatest common divisor
+        gcd = np.gcd(x, y)
+        gcd[gcd == 0] = 1  # only for the relative origin, which stays (0, 0)
+        directions = (x // gcd + span) * width + (y // gcd + span)
 
-        if n_asteroids > max_asteroids_detected:
-            max_asteroids_detected = n_asteroids
-            best_position = (x_ref, y_ref)
+        # the number of asteroids detected is the number of different directions
+        directions.sort(axis=1)
+        n_directions = 1 + (directions[:, 1:] != directions[:, :-1]).sum(axis=1)
+        n_asteroids_detected[start:start+tile_size] = n_directions - 1  # don't forget to subtract 1 for the origin
 
-    return best_position, max_asteroids_detected
+    best_idx = int(n_asteroids_detected.argmax())
+    return tuple(coordinates[best_idx]), int(n_asteroids_detected[best_idx])
 
 
 def get_asteroid_vaporization_order(monitoring_station : Tuple[int, int], coordinates : list) -> list:
     """Returns the order in which the asteroids will be destroyed, given that the
     laser starts shooting "up" from the monitoring station and moves clockwise.
+
+    The asteroids are grouped by their exact direction from the station (their
+    relative position reduced by the greatest common divisor), and sorted by
+    distance within each direction. In each rotation, the laser vaporizes the
+    closest remaining asteroid in every direction, so the asteroids are vaporized
+    in order of their rank within their direction, then of the angle of the direction.
     """
     x_ref, y_ref = monitoring_station
 
-    # make all positions now relative to the monitoring station
-    # we do this in a way that makes right and up positive on the x and y axes
-    asteroids_relative_positions = [(x-x_ref, y_ref-y) for x, y in coordinates]
-    asteroids_relative_positions.remove((0, 0))
-
-    # redefine all relative positions as a tuple of angle and distance to the origin,
-    # with straight up being 0 degrees
-    asteroids_polar_coordinates = [get_polar_coordinates(x, y) for x, y in asteroids_relative_positions]
+    # make all positions now relative to the monitoring station, and group them by direction
+    asteroids_by_direction = {}
+    for x, y in coordinates:
+        if (x, y) != (x_ref, y_ref):
+            direction = reduce_asteroid_positions(x - x_ref, y - y_ref)
+            asteroids_by_direction.setdefault(direction, []).append((x, y))
 
-    # sort by the bond angles, then by the distances
-    asteroids_polar_coordinates.sort(key=itemgetter(0, 1))
+    # sort the directions clockwise, starting straight up (y decreases going up)
+    directions = sorted(asteroids_by_direction, key=cmp_to_key(compare_directions))
 
-    # now just loop over the angles
-    angle_prev = None
+    # the k-th closest asteroid in a direction is vaporized in the k-th rotation
     asteroid_vaporization_order = []
-    from copy import deepcopy
-    while len(asteroids_polar_coordinates):
-        # do a clockwise vaporization
-        for angle, distance in asteroids_polar_coordinates:
-            if angle != angle_prev:
-                asteroid_vaporization_order.append((angle, distance))
-                angle_prev = angle
-        for vaporized_asteroid in asteroid_vaporization_order:
-            try:
-                asteroids_polar_coordinates.remove(vaporized_asteroid)
-            except:
-                pass
-        angle_prev = None  # reset
-
-    return asteroid_vaporization_order
-
-
-def get_polar_coordinates(x : int, y : int) -> Tuple[float, float]:
-    """Returns (x, y) in polar coordinates.
-    """
-    def _get_angle(x : int, y : int) -> float:
-        """Gets the angle between a straight line up from the origin, and a line
-        drawn from the origin to (x, y). The origin is at (0, 0). The angle is
-        defined as 0 for a line going straight up, and increasing going clockwise.
-        """
-        angle = math.atan2(y, x)  # math.atan2() output is between -pi and pi
-
-        # the lines below are to shift the angle so that it ranges from 0 to 2pi,
-        # and that 0 is defined as the angle for a line going straight up
-        angle -= math.pi/2
-        angle *= -1
-        if angle < 0:
-            angle += 2* math.pi
-        if angle == -0:
-            angle = 0
-        return angle
-
-    def _get_distance(x : int, y : int) -> float:
-        """Gets the distance from the origin to (x, y). The origin is at (0, 0).
-        """
-        distance = math.sqrt(x**2 + y**2)
-        return distance
-
-    angle = _get_angle(x, y)
-    distance = _get_distance(x, y)
+    for angle_rank, direction in enumerate(directions):
+        asteroids = asteroids_by_direction[direction]
+        asteroids.sort(key=lambda asteroid: abs(asteroid[0] - x_ref) + abs(asteroid[1] - y_ref))
+        for rotation, asteroid in enumerate(asteroids):
+            asteroid_vaporization_order.append((rotation, angle_rank, asteroid))
+    asteroid_vaporization_order.sort()
 
-    return (angle, distance)
+    return [asteroid for _, _, asteroid in asteroid_vaporization_order]
 
 
-def get_cartesian_coordinates(angle : float, distance : float, origin : Tuple[int, int]=(0,0)) -> Tuple[int, int]:
-    """Returns (angle, distance) in Cartesian coordinates. As we know
-    all the original coordinates were integers, this is accounted for
-    before returning.
+def compare_directions(direction_1 : Tuple[int, int], direction_2 : Tuple[int, int]) -> int:
+    """Compares two directions (x, y) by their clockwise angle from straight up, on a
+    map where y increases going down. Only integer arithmetic is used, so directions
+    which are very close together are still ordered exactly.
     """
-    angle *= -1
-    angle += math.pi/2
-    x = origin[0] + distance * math.cos(angle)
-    y = origin[1] - distance * math.sin(angle)
-    return (math.ceil(x-0.5), math.ceil(y-0.5))
+    def _get_half(x : int, y : int) -> int:
+        """Gets 0 for the directions from straight up (included) to straight down,
+        and 1 for the directions from straight down (included) back to straight up.
+        """
+        return 0 if x > 0 or (x == 0 and y < 0) else 1
+
+    half_1, half_2 = _get_half(*direction_1), _get_half(*direction_2)
+    if half_1 != half_2:
+        return half_1 - half_2
+
+    # within the same half, direction 2 is clockwise from direction 1 if the cross
+    # product is positive
+    cross_product = direction_1[0] * direction_2[1] - direction_1[1] * direction_2[0]
+    return -1 if cross_product > 0 else (1 if cross_product < 0 else 0)
 
 
 def main():
@@ -150,8 +142,7 @@ def main():
                                                                   coordinates=asteroid_coordinates)
 
     # we need the coordinates of the 200th asteroid to be vaporized
-    angle, distance = asteroid_vaporization_order[199]
-    x, y = get_cartesian_coordinates(angle, distance, origin=best_position)
+    x, y = asteroid_vaporization_order[199]
 
     # the answer to the puzzle is the following:
     answer = x * 100 + y
@@ -1,73 +1,133 @@
 # --- Day 2: 1202 Program Alarm ---
-from copy import deepcopy
 from typing import Tuple
+import os
+import sys
+import numpy as np
 
+# the Intcode computer is shared by all the 2019 Intcode puzzles
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from intcode import Intcode_budget_exceeded, Intcode_computer, Intcode_snapshot, load_program
+from intcode.batch import Intcode_batch
 
-def run_program(program_memory : list) -> int:
-    """Runs an intcode program. The output is the value at memory address 0.
-    Modified the variables to use the terminology provided.
-    """
-    memory = deepcopy(program_memory)
-    instruction_pointer = 0  # the address at the current instruction
-    while memory[instruction_pointer] != 99:
-
-        int1_address = memory[instruction_pointer + 1]
-        int2_address = memory[instruction_pointer + 2]
-        int1 = memory[int1_address]
-        int2 = memory[int2_address]
+# the number of noun/verb pairs to try at once, when they have to be searched for
+BATCH_SIZE = 10000
 
-        new_address = memory[instruction_pointer + 3]
-
-        if new_address >= len(memory):
-            # invalid address
-            return None
-        elif memory[instruction_pointer] == 1:
-            memory[new_address] = int1 + int2
-        elif memory[instruction_pointer] == 2:
-            memory[new_address] = int1 * int2
 
-        instruction_pointer += 4
-
-        # check if 99 still in memory
-        if 99 not in memory:
-            # prevent an infinite loop
-            return None
+def run_program(program_snapshot : Intcode_snapshot, noun : int, verb : int) -> int:
+    """Runs an intcode program, with the given noun and verb at addresses 1 and 2.
+    The output is the value at memory address 0. Each run works on a copy-on-write
+    fork of the program, so only the addresses the run writes to are copied.
+    """
+    computer = program_snapshot.fork()
+    computer.write(address=1, value=noun)
+    computer.write(address=2, value=verb)
+    try:
+        computer.run()
+    except (ValueError, IndexError):
+        # invalid instruction or address
+        return None
+    except Intcode_budget_exceeded:
+        # prevent an infinite loop
+        return None
 
     # program ran successfully, this is the output
-    return memory[0]  # the output
+    return computer.read(address=0)  # the output
 
 
-def find_noun_and_verb(program : list) -> Tuple[int, int]:
-    """Tries different values for the noun and verb until the output of the gravity
-    assist program is equal to 19690720.
+def solve_noun_and_verb_linearly(program_snapshot : Intcode_snapshot,
+                                 n_values : int,
+                                 target : int) -> Tuple[int, int]:
+    """Probes the program to check whether its output is an affine function of the
+    noun and verb, i.e. output = constant + a * noun + b * verb, in which case the
+    noun and verb which give the `target` output can be solved for directly instead
+    of searched for. Returns None if the output is not affine (or if no solution
+    is found), in which case the search has to fall back to brute force.
     """
-    for noun in range(len(program)):
-        for verb in range(len(program)):
-
-            # change the addresses at positions 1 and 2
-            program[1] = noun
-            program[2] = verb
-
-            # run the program
-            output = run_program(program_memory=program)
+    def probe(noun : int, verb : int) -> int:
+        return run_program(program_snapshot=program_snapshot, noun=noun, verb=verb)
+
+    constant = probe(noun=0, verb=0)
+    output_1_0 = probe(noun=1, verb=0)
+    output_0_1 = probe(noun=0, verb=1)
+    if None in (constant, output_1_0, output_0_1):
+        return None
+    a = output_1_0 - constant
+    b = output_0_1 - constant
+
+    # check the affine model at a couple more points, where e.g. a product of the
+    # noun and verb would show up
+    for noun, verb in [(1, 1), (n_values - 1, n_values - 2)]:
+        if probe(noun=noun, verb=verb) != constant + a * noun + b * verb:
+            return None
 
-            if output == 19690720:
-                return noun, verb
+    # solve target = constant + a * noun + b * verb, taking the smallest noun (as
+    # the brute force search would)
+    for noun in range(n_values):
+        remainder = target - constant - a * noun
+        if b == 0:
+            if remainder != 0:
+                continue
+            verb = 0
+        elif remainder % b == 0 and 0 <= remainder // b < n_values:
+            verb = remainder // b
+        else:
+            continue
+
+        # double check the solution by actually running the program
+        if probe(noun=noun, verb=verb) == target:
+            return noun, verb
+        return None
+
+    return None
+
+
+def find_noun_and_verb(program : list, target : int=19690720) -> Tuple[int, int]:
+    """Finds values for the noun and verb for which the output of the gravity assist
+    program is equal to `target` (by default 19690720). If the output is an affine
+    function of the noun and verb, they are solved for directly; otherwise, tries
+    different values for the noun and verb (in batches) until the output is the
+    `target`.
+    """
+    # the gravity assist program has no jumps, so a run should never take more
+    # steps than there are addresses; the budget guards against an infinite loop
+    program_snapshot = Intcode_computer(memory=program, max_steps=len(program)).snapshot()
+
+    solution = solve_noun_and_verb_linearly(program_snapshot=program_snapshot,
+                                            n_values=len(program),
+                                            target=target)
+    if solution is not None:
+        return solution
+
+    # otherwise, try all the nouns and verbs, running a batch of nouns (with every
+    # verb) at a time as the lanes of a vectorized batch
+    n_values = len(program)
+    n_nouns_per_batch = max(1, BATCH_SIZE // n_values)
+    for first_noun in range(0, n_values, n_nouns_per_batch):
+        nouns = np.arange(first_noun, min(first_noun + n_nouns_per_batch, n_values))
+        batch_nouns = np.repeat(nouns, n_values)
+        batch_verbs = np.tile(np.arange(n_values), len(nouns))
+
+        # the budget guards against an infinite loop, as in `run_program`
+        batch = Intcode_batch(memory=program,
+                              n_lanes=len(batch_nouns),
+                              initial_values={1: batch_nouns, 2: batch_verbs},
+                              max_steps=n_values)
+        batch.run()
+
+        found = np.flatnonzero(batch.halted & (batch.memory[:, 0] == target))
+        if len(found):
+            return int(batch_nouns[found[0]]), int(batch_verbs[found[0]])
 
     # this part should never be reached
     return None, None
 
 
 def main():
-    with open("input", "r") as input_data:
-        # read entries; each entry is separated by a comma
-        gravity_assist_program = input_data.read().split(",")
-    
-        # convert to integers
-        gravity_assist_program = [int(i) for i in gravity_assist_program]
-    
-        # find values of the noun and verb which cause the program to output 19690720
-        noun, verb = find_noun_and_verb(program=gravity_assist_program)
+    # read entries; each entry is separated by a comma (parsed once, then cached)
+    gravity_assist_program = load_program("input")
+
+    # find values of the noun and verb which cause the program to output 19690720
+    noun, verb = find_noun_and_verb(program=gravity_assist_program)
     
     # the answer to the puzzle is equal to 100 * noun + verb
     answer = 100 * noun + verb
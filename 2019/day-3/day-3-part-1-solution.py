@@ -1,35 +1,120 @@
 # --- Day 3: Crossed Wires ---
+from typing import Iterator, Tuple
+import bisect
+import itertools
 
 
-def get_path(path : list) -> list:
-    """Given an input wire path, outputs a list of all the coordinates that the wire
-    passes over (excluding the origin).
+def get_segments(path : list) -> Tuple[list, list]:
+    """Given an input wire path, outputs its horizontal and vertical segments. Each
+    segment is given as (line, low, high, start, n_steps): the y coordinate of a
+    horizontal segment (or the x coordinate of a vertical one), the range of x (or y)
+    coordinates it covers, the coordinate it starts from, and the number of steps the
+    wire has traveled before reaching its start. Only the segments are stored, never
+    the individual coordinates that the wire passes over.
     """
     x, y = 0, 0  # start at the origin
 
-    path_coordinates = []  # we will use this list to keep track of visited coordinates
+    horizontal_segments, vertical_segments = [], []
+    n_steps = 0
     for instruction in path:
 
-        target_coord = int(instruction[1:])
+        length = int(instruction[1:])
 
-        if instruction[0] == "R":
-            for x_coord in range(x + 1, x + target_coord + 1):
-                path_coordinates.append((x_coord, y))
-            x += target_coord  # update the state
-        elif instruction[0] == "U":
-            for y_coord in range(y + 1, y + target_coord + 1):
-                path_coordinates.append((x, y_coord))
-            y += target_coord  # update the state
-        elif instruction[0] == "L":
-            for x_coord in range(x - 1, x - target_coord - 1, -1):
-                path_coordinates.append((x_coord, y))
-            x -= target_coord  # update the state
-        elif instruction[0] == "D":
-            for y_coord in range(y - 1, y - target_coord - 1, -1):
-                path_coordinates.append((x, y_coord))
-            y -= target_coord  # update the state
+        if instruction[0] in ("R", "L"):
+            new_x = x + length if instruction[0] == "R" else x - length
+            horizontal_segments.append((y, min(x, new_x), max(x, new_x), x, n_steps))
+            x = new_x  # update the state
+        elif instruction[0] in ("U", "D"):
+            new_y = y + length if instruction[0] == "U" else y - length
+            vertical_segments.append((x, min(y, new_y), max(y, new_y), y, n_steps))
+            y = new_y  # update the state
+        n_steps += length
 
-    return path_coordinates
+    return horizontal_segments, vertical_segments
+
+
+def find_crossings(horizontal_segments : list, vertical_segments : list) -> Iterator[tuple]:
+    """Finds the points where horizontal segments (of one wire) cross vertical segments
+    (of the other), as (x, y, n_steps along the horizontal segment, n_steps along the
+    vertical segment).
+
+    A vertical line is swept from left to right across the segments. The horizontal
+    segments that it currently crosses are kept sorted by their y coordinate, so the
+    ones crossing each vertical segment are found by bisecting on its range of y.
+    """
+    # at the same x, horizontal segments are added before the vertical segments are
+    # checked against them, and removed after (since the ends of segments count)
+    ADD, CHECK, REMOVE = 0, 1, 2
+    events = []
+    for idx, (_, low, high, _, _) in enumerate(horizontal_segments):
+        events.append((low, ADD, idx))
+        events.append((high, REMOVE, idx))
+    for idx, (x, _, _, _, _) in enumerate(vertical_segments):
+        events.append((x, CHECK, idx))
+    events.sort()
+
+    active = []  # (y, idx) of the horizontal segments crossing the sweep line
+    for x, event, idx in events:
+        if event == ADD:
+            bisect.insort(active, (horizontal_segments[idx][0], idx))
+        elif event == REMOVE:
+            active.pop(bisect.bisect_left(active, (horizontal_segments[idx][0], idx)))
+        else:
+            _, low, high, y_start, vertical_n_steps = vertical_segments[idx]
+            first = bisect.bisect_left(active, (low,))
+            last = bisect.bisect_left(active, (high + 1,))
+            for y, horizontal_idx in active[first:last]:
+                _, _, _, x_start, horizontal_n_steps = horizontal_segments[horizontal_idx]
+                yield (x,
+                       y,
+                       horizontal_n_steps + abs(x - x_start),
+                       vertical_n_steps + abs(y - y_start))
+
+
+def find_overlaps(segments_1 : list, segments_2 : list) -> Iterator[tuple]:
+    """Finds the points where parallel segments of the two wires overlap, as (line,
+    coordinate along the line, n_steps along segment 1, n_steps along segment 2). Only
+    the points of each overlap which can be the closest to the origin, or reached in
+    the fewest steps, are returned: its ends, and the points nearest the origin.
+    """
+    segments_2_by_line = {}
+    for segment in segments_2:
+        segments_2_by_line.setdefault(segment[0], []).append(segment)
+
+    for line, low_1, high_1, start_1, n_steps_1 in segments_1:
+        for _, low_2, high_2, start_2, n_steps_2 in segments_2_by_line.get(line, ()):
+            low, high = max(low_1, low_2), min(high_1, high_2)
+            if low > high:
+                continue  # the segments do not overlap
+            for coordinate in {low, high, min(max(-1, low), high), min(max(1, low), high),
+                               min(max(0, low), high)}:
+                yield (line,
+                       coordinate,
+                       n_steps_1 + abs(coordinate - start_1),
+                       n_steps_2 + abs(coordinate - start_2))
+
+
+def find_intersections(path_1 : list, path_2 : list) -> Iterator[tuple]:
+    """Finds the points where the two wires intersect (excluding the origin), as (x, y,
+    n_steps of wire 1, n_steps of wire 2). Where the wires overlap, only the points of
+    the overlap which can be the closest to the origin, or reached in the fewest steps,
+    are returned.
+    """
+    horizontal_segments_1, vertical_segments_1 = get_segments(path=path_1)
+    horizontal_segments_2, vertical_segments_2 = get_segments(path=path_2)
+
+    intersections = itertools.chain(
+        find_crossings(horizontal_segments_1, vertical_segments_2),
+        ((x, y, n_steps_1, n_steps_2) for x, y, n_steps_2, n_steps_1
+         in find_crossings(horizontal_segments_2, vertical_segments_1)),
+        ((x, y, n_steps_1, n_steps_2) for y, x, n_steps_1, n_steps_2
+         in find_overlaps(horizontal_segments_1, horizontal_segments_2)),
+        ((x, y, n_steps_1, n_steps_2) for x, y, n_steps_1, n_steps_2
+         in find_overlaps(vertical_segments_1, vertical_segments_2)),
+    )
+    for x, y, n_steps_1, n_steps_2 in intersections:
+        if (x, y) != (0, 0):
+            yield x, y, n_steps_1, n_steps_2
 
 
 def main():
@@ -42,15 +127,11 @@ def main():
             split_path = path.split(",")
             wire_paths_split.append(split_path)
 
-    # trace out the paths for each wire, and take the set (we don't need the path in order for this)
-    wire_1_path_coordinates = set(get_path(path=wire_paths_split[0]))
-    wire_2_path_coordinates = set(get_path(path=wire_paths_split[1]))
-
-    # find the points where the two wires intersect, and calculate the Manhattan distance to the origin
-    manhattan_distances = []
-    for coordinates in wire_1_path_coordinates:
-        if coordinates in wire_2_path_coordinates:  # wires intersect here
-            manhattan_distances.append(abs(coordinates[0]) + abs(coordinates[1]))
+    # find the points where the two wires intersect (from the segments of the wires, without
+    # tracing out every coordinate), and calculate the Manhattan distance to the origin
+    manhattan_distances = [abs(x) + abs(y) for x, y, _, _
+                           in find_intersections(path_1=wire_paths_split[0],
+                                                 path_2=wire_paths_split[1])]
 
     # the answer to the puzzle is the minimum Manhattan distance to any intersection
     # point (excluding the origin)
@@ -1,10 +1,20 @@
 # --- Day 4: Secure Container ---
-import re
+from functools import lru_cache, reduce
+import itertools
 
+# runs of identical adjacent digits longer than this all count the same
+MAX_RUN_LENGTH = 3
 
-def does_number_meet_password_criteria(number : str) -> int:
-    """Checks if the input number meets the specified password criteria. If yes,
-    returns 1. Otherwise, returns 0.
+
+def does_run_meet_criteria(run_length : int) -> bool:
+    """Checks if a run of identical adjacent digits meets the password criteria: exactly
+    two adjacent digits are the same (not part of a larger group).
+    """
+    return run_length == 2
+
+
+def does_password_meet_criteria(digits : tuple) -> bool:
+    """Checks if a password, given as its digits, meets the password criteria.
     """
     # first condition: be a six-digit number
     # (by default true)
@@ -14,23 +24,69 @@ def does_number_meet_password_criteria(number : str) -> int:
 
     # third condition: at least one occurrence of two, and no more than two,
     # adjacent digits being the same
-    if not re.search("(\\d)\\1", number):
-        return 0
-    else:
-        if re.search("(\\d)\\1{4}", number):  # check for 5 sequential identical numbers
-            return 0
-        else:
-            split_number = re.split("(\\d)\\1{2}", number)  # remove any length 3 sequences of identical numbers
-            adjacent_digits = [re.search("(\\d)\\1", split) for split in split_number]
-            if not any(adjacent_digits):
-                return 0
+    run_lengths = [len(list(run)) for _, run in itertools.groupby(digits)]
+    if not any(does_run_meet_criteria(run_length) for run_length in run_lengths):
+        return False
 
     # fourth condition: going from left to right, the digits never decrease
-    digits_increasing = [int(n) >= int(number[idx]) for idx, n in enumerate(number[1:])]
-    if not all(digits_increasing):
+    return all(digit >= previous_digit for previous_digit, digit in zip(digits, digits[1:]))
+
+
+def count_passwords(low : int, high : int) -> int:
+    """Counts the passwords in the range [low, high] which meet the criteria. Since
+    the digits of a password never decrease, only the non-decreasing sequences of
+    digits (i.e. the combinations with replacement of the digits) are enumerated,
+    rather than every number in the range (e.g. 3003 sequences of 6 digits from 1-9,
+    instead of up to 900000 numbers).
+    """
+    n_passwords = 0
+    for n_digits in range(len(str(low)), len(str(high)) + 1):
+        # a leading digit of 0 would be followed by more 0s, so no digit is 0
+        for digits in itertools.combinations_with_replacement(range(1, 10), n_digits):
+            number = reduce(lambda number, digit: 10 * number + digit, digits)
+            if low <= number <= high and does_password_meet_criteria(digits=digits):
+                n_passwords += 1
+    return n_passwords
+
+
+def count_passwords_in_range(low : int, high : int) -> int:
+    """Counts the passwords in the range [low, high] which meet the criteria, using
+    dynamic programming over the digits, so the cost only grows with the number of
+    digits of the bounds (and not with the size of the range).
+    """
+    return _count_passwords_up_to(high) - _count_passwords_up_to(low - 1)
+
+
+def _count_passwords_up_to(bound : int) -> int:
+    """Counts the passwords from 1 to `bound` which meet the criteria.
+    """
+    if bound < 1:
         return 0
+    # the numbers with fewer digits than the bound are all up to 99...9
+    n_passwords = _count_passwords_up_to(10 ** (len(str(bound)) - 1) - 1)
+    bound_digits = tuple(int(digit) for digit in str(bound))
+
+    @lru_cache(maxsize=None)
+    def count(position : int, last_digit : int, run_length : int, found : bool, tight : bool) -> int:
+        """Counts the ways of completing a password from the digit at `position`,
+        after a run of `run_length` digits `last_digit`, where `found` tells if an
+        earlier run met the criteria, and `tight` if the digits so far are those of
+        the bound.
+        """
+        if position == len(bound_digits):
+            return int(found or does_run_meet_criteria(run_length))
+        max_digit = bound_digits[position] if tight else 9
+        n_completions = 0
+        for digit in range(max(last_digit, 1), max_digit + 1):
+            if digit == last_digit:  # the run goes on
+                next_state = (min(run_length + 1, MAX_RUN_LENGTH), found)
+            else:                    # the run ends, and a new one starts
+                next_state = (1, found or does_run_meet_criteria(run_length))
+            n_completions += count(position + 1, digit, *next_state, tight and digit == max_digit)
+        return n_completions
+
+    return n_passwords + count(0, 0, 0, False, True)
 
-    return 1
 
 def main():
     with open("input", "r") as input_data:
@@ -38,9 +94,7 @@ def main():
         password_bounds = [int(i) for i in input_data.read().split("\n")[0].split("-")]
 
     # check how many passwords in the input range meet the criteria
-    n_meet_criteria = 0
-    for n in range(password_bounds[0], password_bounds[1]+1):
-        n_meet_criteria += does_number_meet_password_criteria(number=str(n))
+    n_meet_criteria = count_passwords(low=password_bounds[0], high=password_bounds[1])
 
     # the answer to the puzzle is the number of different passwords within the input
     # range which match the criteria
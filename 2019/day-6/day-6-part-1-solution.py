@@ -1,4 +1,25 @@
 # --- Day 6: Universal Orbit Map ---
+from collections import deque
+
+
+def get_orbit_depths(orbit_dict : dict) -> dict:
+    """Gets the depth of every object in the orbit map, i.e. the number of objects it
+    orbits directly or indirectly, in a single pass down from the universal Center of
+    Mass (COM), so that no path to COM is walked more than once.
+    """
+    orbiters = {}
+    for orbiter, com in orbit_dict.items():
+        orbiters.setdefault(com, []).append(orbiter)
+
+    depths = {"COM": 0}
+    to_visit = deque(["COM"])
+    while to_visit:
+        com = to_visit.popleft()
+        for orbiter in orbiters.get(com, ()):
+            depths[orbiter] = depths[com] + 1
+            to_visit.append(orbiter)
+
+    return depths
 
 
 def main():
@@ -12,19 +33,14 @@ def main():
         com, orbiter = line.split(")")
         orbit_dict[orbiter] = com
 
-    # get the number of direct and indirect orbits
-    n_direct_orbits = 0
-    n_indirect_orbits = 0
-    for orbiter in orbit_dict.keys():
-        com = orbit_dict[orbiter]
-        n_direct_orbits += 1
-        while com != "COM":
-            com = orbit_dict[com]
-            n_indirect_orbits += 1
+    # get the number of direct and indirect orbits; each object orbits exactly
+    # one object directly, and every other object on its way to COM indirectly,
+    # so its depth is its total number of orbits
+    depths = get_orbit_depths(orbit_dict=orbit_dict)
 
     # the answer to the puzzle is the total number of direct and indirect
     # orbits in the map data
-    answer = n_direct_orbits + n_indirect_orbits
+    answer = sum(depths.values())
 
     print("Answer:", answer)
 
@@ -1,4 +1,84 @@
 # --- Day 6: Universal Orbit Map ---
+from collections import deque
+
+
+class Orbit_tree():
+    """The orbit map as a tree rooted at the universal Center of Mass (COM), which
+    answers queries for the number of orbital transfers between any two objects in
+    O(log n) each, using their lowest common ancestor.
+
+    The depths of all the objects are computed in a single pass down from COM, and
+    the ancestors of each object at every power-of-two distance are precomputed
+    (binary lifting), so that the lowest common ancestor of two objects is found by
+    jumping up the tree in at most log2(n) steps.
+
+    Example usage:
+    >> orbit_tree = Orbit_tree(orbit_dict=orbit_dict)
+    >> n_orbital_transfers = orbit_tree.get_distance("B", "K")
+    """
+    def __init__(self, orbit_dict : dict) -> None:
+        """Builds the tree from a dictionary mapping each orbiter to the object it
+        orbits directly.
+        """
+        orbiters = {}
+        for orbiter, com in orbit_dict.items():
+            orbiters.setdefault(com, []).append(orbiter)
+
+        # number the objects in breadth-first order from COM, so that every object
+        # comes after the object it orbits
+        self.index = {"COM": 0}
+        self.depths = [0]
+        parents = [0]  # COM is its own parent
+        to_visit = deque(["COM"])
+        while to_visit:
+            com = to_visit.popleft()
+            com_idx = self.index[com]
+            for orbiter in orbiters.get(com, ()):
+                self.index[orbiter] = len(self.depths)
+                self.depths.append(self.depths[com_idx] + 1)
+                parents.append(com_idx)
+                to_visit.append(orbiter)
+
+        # `self.ancestors[k][idx]` is the ancestor 2**k levels above object idx (or COM)
+        self.ancestors = [parents]
+        for _ in range(max(self.depths).bit_length() - 1):
+            previous = self.ancestors[-1]
+            self.ancestors.append([previous[ancestor] for ancestor in previous])
+
+    def get_depth(self, name : str) -> int:
+        """Gets the number of objects that an object orbits directly or indirectly.
+        """
+        return self.depths[self.index[name]]
+
+    def get_common_ancestor(self, name_1 : str, name_2 : str) -> int:
+        """Gets the index of the lowest common ancestor of two objects, i.e. the
+        closest object which both of them orbit (directly or indirectly), or one of
+        the objects itself, if the other one orbits it.
+        """
+        idx_1, idx_2 = self.index[name_1], self.index[name_2]
+        if self.depths[idx_1] < self.depths[idx_2]:
+            idx_1, idx_2 = idx_2, idx_1
+
+        # first, move the deeper object up to the depth of the other one
+        depth_difference = self.depths[idx_1] - self.depths[idx_2]
+        for k, ancestors in enumerate(self.ancestors):
+            if depth_difference >> k & 1:
+                idx_1 = ancestors[idx_1]
+        if idx_1 == idx_2:
+            return idx_1
+
+        # then, move both up as far as possible while they stay apart
+        for ancestors in reversed(self.ancestors):
+            if ancestors[idx_1] != ancestors[idx_2]:
+                idx_1, idx_2 = ancestors[idx_1], ancestors[idx_2]
+        return self.ancestors[0][idx_1]
+
+    def get_distance(self, name_1 : str, name_2 : str) -> int:
+        """Gets the number of orbital transfers needed to move between two objects.
+        """
+        common_ancestor = self.get_common_ancestor(name_1, name_2)
+        return (self.get_depth(name_1) + self.get_depth(name_2)
+                - 2 * self.depths[common_ancestor])
 
 
 def main():
@@ -12,24 +92,13 @@ def main():
         com, orbiter = line.split(")")
         orbit_dict[orbiter] = com
 
-    # get the path of objects from SAN to COM
-    com = orbit_dict["SAN"]
-    santa_path = [com]
-    while com != "COM":
-        com = orbit_dict[com]
-        santa_path.append(com)
-
-    # get the number of orbital transfers required to move from the
-    # object YOU are orbiting to the first object on SAN's path
-    n_orbital_transfers = 0
-    com = orbit_dict["YOU"]
-    while com not in santa_path:
-        com = orbit_dict[com]
-        n_orbital_transfers += 1
-
-    # now just add the number of orbital transfers back to SAN from the inter-
-    # secting object on SAN's path, which is the same as its index on `santa_path`
-    n_orbital_transfers += santa_path.index(com)
+    # index the orbit map as a tree
+    orbit_tree = Orbit_tree(orbit_dict=orbit_dict)
+
+    # get the number of orbital transfers required to move from the object YOU
+    # are orbiting to the object SAN is orbiting, which go through the closest
+    # object that both of them orbit
+    n_orbital_transfers = orbit_tree.get_distance(orbit_dict["YOU"], orbit_dict["SAN"])
 
     # the answer to the puzzle is the minimum number of orbital transfers required
     # to move from the object YOU are orbiting to the object SAN is orbiting
@@ -1,19 +1,30 @@
 # --- Day 8: Space Image Format ---
+import numpy as np
 
 
-def get_picture_layers(picture : str, width : int, height : int) -> list:
-    """Splits the input picture from Space Image Format into its corresponding layers.
+def get_picture_layers(picture : bytes, width : int, height : int) -> np.ndarray:
+    """Splits the input picture from Space Image Format into its corresponding layers,
+    as an array of digits of shape (n_layers, height, width).
     """
-    n_digits_per_layer = width * height
-    # split the `picture` string into multiple substrings, one for each layer
-    layers = [picture[i:i+n_digits_per_layer] for i in range(0, len(picture), n_digits_per_layer)]
-    return layers
+    # the digits are read straight from the characters of the picture, whose codes
+    # are offset by the code of "0"
+    digits = np.frombuffer(picture, dtype=np.uint8) - ord("0")
+    return digits.reshape(-1, height, width)
+
+
+def count_digits(layers : np.ndarray) -> np.ndarray:
+    """Counts the digits 0-9 in each layer, as an array of shape (n_layers, 10).
+    """
+    n_layers = len(layers)
+    # offset the digits of each layer so that all the layers are counted at once
+    offset_digits = layers.reshape(n_layers, -1) + 10 * np.arange(n_layers)[:, np.newaxis]
+    return np.bincount(offset_digits.ravel(), minlength=10 * n_layers).reshape(n_layers, 10)
 
 
 def main():
-    with open("input", "r") as input_data:
+    with open("input", "rb") as input_data:
         # load the input password
-        password_picture = input_data.read().split("\n")[0]
+        password_picture = input_data.read().split(b"\n")[0]
 
     image_width = 25
     image_height = 6
@@ -22,15 +33,12 @@ def main():
     picture_layers = get_picture_layers(picture=password_picture, width=image_width, height=image_height)
 
     # find the layer that contains the fewest 0 digits
-    layer_0_count = []
-    for layer in picture_layers:
-        layer_0_count.append(layer.count("0"))
-
-    layer_with_fewest_0s = picture_layers[layer_0_count.index(min(layer_0_count))]
+    digit_counts = count_digits(layers=picture_layers)
+    counts_in_layer_with_fewest_0s = digit_counts[digit_counts[:, 0].argmin()]
 
     # the answer to the puzzle is the number of 1 digits multiplied by the number
     # of 2 digits in the layer with the fewest 0 digits
-    answer = layer_with_fewest_0s.count("1") * layer_with_fewest_0s.count("2")
+    answer = int(counts_in_layer_with_fewest_0s[1] * counts_in_layer_with_fewest_0s[2])
 
     print("Answer:", answer)
 
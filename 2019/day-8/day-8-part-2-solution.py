@@ -1,31 +1,42 @@
 # --- Day 8: Space Image Format ---
+from typing import BinaryIO
+import numpy as np
 
 
-def decode_picture(picture : str, width : int, height : int) -> list:
+def decode_picture(picture : bytes, width : int, height : int) -> np.ndarray:
     """Decodes the input picture from Space Image Format into normal encoding.
     As per the problem statement: Digits fill row of image left-to-right,
     then downward to next row, then onwards to the next layer (e.g. 3D image).
     """
-    n_digits_per_layer = width * height
-
-    # split the `picture` string into multiple substrings, one for each layer, and
-    # convert each substring into a list of integers
-    layers = [list(int(j) for j in picture[i:i+n_digits_per_layer]) for i in range(0, len(picture), n_digits_per_layer)]
+    # read the digits straight from the characters of the picture, whose codes are
+    # offset by the code of "0", and stack them into layers
+    layers = (np.frombuffer(picture, dtype=np.uint8) - ord("0")).reshape(-1, height, width)
 
     # the image is rendered by stacking the layers and aligning the pixels with
-    # the same positions in each layer, where 0:black, 1:white, 2:transparent
-    top_visible_layer = layers[0]
-    for pixel_idx, pixel in enumerate(top_visible_layer):
-        if pixel == 2:
-            layer_idx = 0
-            while pixel == 2:
-                layer_idx += 1
-                pixel = layers[layer_idx][pixel_idx]
-            top_visible_layer[pixel_idx] = pixel
-
-    # reshape the top visible layer into a square
-    image = [top_visible_layer[i:i+width] for i in range(0, len(top_visible_layer), width)]
+    # the same positions in each layer, where 0:black, 1:white, 2:transparent;
+    # each pixel shows the first layer where it is not transparent
+    top_visible_layer = (layers != 2).argmax(axis=0)
+    image = np.take_along_axis(layers, top_visible_layer[np.newaxis], axis=0)[0]
+
+    return image
 
+
+def decode_picture_stream(picture_stream : BinaryIO, width : int, height : int) -> np.ndarray:
+    """Decodes a picture from Space Image Format like `decode_picture`, but reading
+    it from a binary stream one layer at a time, so that only one layer is held in
+    memory at once (e.g. for pictures too large to load whole). Stops reading once
+    no pixel is transparent any more.
+    """
+    n_digits_per_layer = width * height
+    image = np.full((height, width), 2, dtype=np.uint8)  # fully transparent
+    transparent = np.ones((height, width), dtype=bool)
+    while transparent.any():
+        layer_digits = picture_stream.read(n_digits_per_layer).strip()
+        if not layer_digits:
+            break  # the end of the picture
+        layer = (np.frombuffer(layer_digits, dtype=np.uint8) - ord("0")).reshape(height, width)
+        image[transparent] = layer[transparent]
+        transparent = image == 2
     return image
 
 
@@ -41,9 +52,9 @@ def enhance_picture(picture : list) -> list:
 
 
 def main():
-    with open("input", "r") as input_data:
+    with open("input", "rb") as input_data:
         # load the input password
-        password_picture = input_data.read().split("\n")[0]
+        password_picture = input_data.read().split(b"\n")[0]
 
     image_width = 25
     image_height = 6
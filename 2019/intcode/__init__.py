@@ -0,0 +1,8 @@
+from .amplifiers import find_max_thruster_signal, run_amplifiers
+from .computer import (Intcode_budget_exceeded, Intcode_computer, Intcode_loop_detected,
+                       Intcode_snapshot, decode_instruction)
+from .disassembler import Basic_block, Disassembly, disassemble, load_disassembly
+from .loader import load_program, parse_program
+from .memory import Forked_memory, Memory
+from .network import Intcode_machine, Intcode_network
+from .profiler import Intcode_profiler
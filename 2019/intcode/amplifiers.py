@@ -0,0 +1,90 @@
+# --- Amplifier circuits (2019 day 7), built from chained Intcode computers ---
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator
+import itertools
+import math
+import os
+
+from .computer import Intcode_computer
+
+
+def run_amplifiers(program : list, phase_settings : tuple, feedback_loop : bool=False) -> int:
+    """Runs one amplifier per phase setting, each a copy of the Amplifier Controller
+    Software, sending the output of each amplifier to the input of the next (Amp A
+    sees 0 as its first input signal). In feedback loop mode, the output of the last
+    amplifier is sent back to the first one until the amplifiers halt. Returns the
+    last output of the last amplifier, which is the signal sent to the thrusters.
+    """
+    # initially, the phase settings should be used exactly once by each amplifier
+    amplifiers = []
+    for phase_setting in phase_settings:
+        amplifier = Intcode_computer(memory=program, inputs=[phase_setting]).run_generator()
+        next(amplifier)  # run until the amplifier waits for its input signal
+        amplifiers.append(amplifier)
+
+    output = 0
+    try:
+        while True:
+            for amplifier in amplifiers:
+                output = amplifier.send(output)
+            if not feedback_loop:
+                break
+    except StopIteration:
+        pass  # the amplifiers halted
+
+    return output
+
+
+# the Amplifier Controller Software, loaded once in each worker process
+_worker_program = None
+
+
+def _initialize_worker(program : list) -> None:
+    global _worker_program
+    _worker_program = program
+
+
+def _max_thruster_signal(phase_settings_chunk : list, feedback_loop : bool) -> int:
+    return max(run_amplifiers(program=_worker_program,
+                              phase_settings=phase_settings,
+                              feedback_loop=feedback_loop)
+               for phase_settings in phase_settings_chunk)
+
+
+def _chunks(iterable : Iterable, chunk_size : int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+def find_max_thruster_signal(program : list,
+                             phase_values : list,
+                             feedback_loop : bool=False,
+                             n_workers : int=1,
+                             chunk_size : int=None) -> int:
+    """Tries every permutation of the phase values as phase settings for the
+    amplifiers, and returns the largest signal that can be sent to the thrusters.
+
+    With `n_workers` > 1 (or None, for one worker per CPU) the permutations are split
+    into chunks of `chunk_size` and searched in parallel worker processes, each of
+    which receives the program only once, when it starts.
+    """
+    phase_settings_permutations = itertools.permutations(phase_values)
+    if n_workers == 1:
+        _initialize_worker(program=program)
+        return _max_thruster_signal(phase_settings_chunk=phase_settings_permutations,
+                                    feedback_loop=feedback_loop)
+
+    n_workers = n_workers or os.cpu_count()
+    if chunk_size is None:
+        # a few chunks per worker, to balance the load between them
+        n_permutations = math.factorial(len(phase_values))
+        chunk_size = max(1, math.ceil(n_permutations / (4 * n_workers)))
+
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_initialize_worker,
+                             initargs=(program,)) as executor:
+        max_signals = executor.map(partial(_max_thruster_signal, feedback_loop=feedback_loop),
+                                   _chunks(phase_settings_permutations, chunk_size))
+        return max(max_signals)
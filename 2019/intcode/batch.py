@@ -0,0 +1,218 @@
+# --- Batch (vectorized) execution of an Intcode program on many inputs ---
+#
+# Requires NumPy, so (unlike the rest of the package) it is not imported by
+# `intcode` itself: use `from intcode.batch import Intcode_batch`.
+from collections import deque
+
+import numpy as np
+
+from .computer import N_PARAMETERS, WRITE_PARAMETER, decode_handler, decode_instruction
+
+
+class Intcode_batch():
+    """Runs the same Intcode program on many lanes at once, where each lane starts
+    with some different values in memory and/or different inputs (e.g. the nouns and
+    verbs of 2019 day 2, or the system IDs of day 5).
+
+    The memories of all the lanes are the rows of a single 2-D array. Lanes whose
+    instruction pointers agree form a group, which runs each instruction for all of
+    its lanes with a few array operations. A group is split whenever its lanes take
+    different branches (or have different code, if the program modifies itself), and
+    groups which reach the same instruction are merged again.
+
+    Values are stored as 64-bit integers, so the program must not overflow them.
+    A lane which runs an invalid instruction, uses an invalid address or goes over
+    `max_steps` fails (without affecting the other lanes), and a lane which needs an
+    input that has not been provided stops.
+
+    Example usage:
+    >> batch = Intcode_batch(memory=program, n_lanes=100, initial_values={1: nouns, 2: verbs})
+    >> batch.run()
+    >> outputs = batch.memory[:, 0]
+    """
+    def __init__(self,
+                 memory : list,
+                 n_lanes : int,
+                 initial_values : dict=None,
+                 inputs : list=None,
+                 max_steps : int=None) -> None:
+        """Initializes the batch. `initial_values` maps addresses to the values (one
+        per lane) to write there before running, and `inputs` gives the list of input
+        values of each lane.
+        """
+        self.n_lanes = n_lanes
+        self.memory = np.tile(np.array(memory, dtype=np.int64), (n_lanes, 1))
+        for address, values in (initial_values or {}).items():
+            self.memory[:, address] = values
+        self.inputs = [deque(lane_inputs) for lane_inputs in (inputs or [[]] * n_lanes)]
+        self.outputs = [[] for _ in range(n_lanes)]
+        self.instruction_pointer = np.zeros(n_lanes, dtype=np.int64)
+        self.relative_base = np.zeros(n_lanes, dtype=np.int64)
+        self.halted = np.zeros(n_lanes, dtype=bool)
+        self.failed = np.zeros(n_lanes, dtype=bool)
+        self.max_steps = max_steps
+
+    def run(self) -> None:
+        """Runs all the lanes until each of them halts, fails or waits for input.
+        """
+        groups = {0: np.arange(self.n_lanes)}  # lanes, by instruction pointer
+        steps = 0
+        while groups:
+            if self.max_steps is not None and steps >= self.max_steps:
+                for instruction_pointer, lanes in groups.items():
+                    self._stop(lanes, instruction_pointer, failed=True)
+                break
+
+            next_groups = {}
+            for instruction_pointer, lanes in groups.items():
+                for next_instruction_pointer, next_lanes in self._step(instruction_pointer, lanes):
+                    if next_instruction_pointer in next_groups:
+                        next_lanes = np.concatenate([next_groups[next_instruction_pointer],
+                                                     next_lanes])
+                    next_groups[next_instruction_pointer] = next_lanes
+            groups = next_groups
+            steps += 1
+
+    def _stop(self, lanes : np.ndarray, instruction_pointer : int, failed : bool=False) -> None:
+        self.instruction_pointer[lanes] = instruction_pointer
+        if failed:
+            self.failed[lanes] = True
+
+    def _grow(self, size : int) -> None:
+        """Grows the memories to at least `size` addresses (at least doubling them).
+        """
+        if size > self.memory.shape[1]:
+            new_size = max(size, 2 * self.memory.shape[1])
+            self.memory = np.pad(self.memory, ((0, 0), (0, new_size - self.memory.shape[1])))
+
+    def _gather(self, lanes : np.ndarray, addresses : np.ndarray) -> np.ndarray:
+        """Gets the value at the given (non-negative) address of each lane; addresses
+        beyond the end of the memory hold 0.
+        """
+        in_range = addresses < self.memory.shape[1]
+        if in_range.all():
+            return self.memory[lanes, addresses]
+        values = np.zeros(len(lanes), dtype=np.int64)
+        values[in_range] = self.memory[lanes[in_range], addresses[in_range]]
+        return values
+
+    def _step(self, instruction_pointer : int, lanes : np.ndarray) -> list:
+        """Runs the instruction at `instruction_pointer` for a group of lanes, and
+        returns the groups which they split into, as (instruction pointer, lanes).
+        """
+        if instruction_pointer < 0:
+            self._stop(lanes, instruction_pointer, failed=True)
+            return []
+        instructions = self._gather(lanes, np.full(len(lanes), instruction_pointer))
+        if (instructions == instructions[0]).all():
+            return self._execute(instruction_pointer, lanes, int(instructions[0]))
+
+        # the lanes have different code here, since the program modified itself
+        next_groups = []
+        for instruction in np.unique(instructions):
+            next_groups += self._execute(instruction_pointer,
+                                         lanes[instructions == instruction],
+                                         int(instruction))
+        return next_groups
+
+    def _execute(self, instruction_pointer : int, lanes : np.ndarray, instruction : int) -> list:
+        """Runs one instruction for a group of lanes which all have the same code.
+        """
+        try:
+            decode_handler(instruction=instruction, address=instruction_pointer)
+        except ValueError:
+            self._stop(lanes, instruction_pointer, failed=True)
+            return []
+        two_digit_optcode, modes = decode_instruction(instruction)
+        n_parameters = N_PARAMETERS[two_digit_optcode]
+        next_instruction_pointer = instruction_pointer + n_parameters + 1
+        if two_digit_optcode == 99:
+            self._stop(lanes, instruction_pointer)
+            self.halted[lanes] = True
+            return []
+
+        # the address each parameter refers to (for the parameters not in immediate mode)
+        parameters = [self._gather(lanes, np.full(len(lanes), instruction_pointer + idx + 1))
+                      for idx in range(n_parameters)]
+        addresses = [parameter + self.relative_base[lanes] if mode == 2 else parameter
+                     for parameter, mode in zip(parameters, modes)]
+        # only the addresses which every lane uses are checked here: an input
+        # instruction waits for its input first, and a jump only reads its target
+        # in the lanes which do jump
+        n_used = {3: 0, 5: 1, 6: 1}.get(two_digit_optcode, n_parameters)
+        invalid = np.zeros(len(lanes), dtype=bool)
+        for address, mode in zip(addresses[:n_used], modes):
+            if mode != 1:
+                invalid |= address < 0
+        if invalid.any():
+            self._stop(lanes[invalid], instruction_pointer, failed=True)
+            valid = ~invalid
+            lanes = lanes[valid]
+            parameters = [parameter[valid] for parameter in parameters]
+            addresses = [address[valid] for address in addresses]
+            if not len(lanes):
+                return []
+
+        write_parameter = WRITE_PARAMETER.get(two_digit_optcode)
+        values = [parameter if mode == 1 else self._gather(lanes, address)
+                  for idx, (parameter, address, mode) in enumerate(zip(parameters, addresses, modes))
+                  if idx < n_used and idx != write_parameter]
+
+        if two_digit_optcode in (1, 2, 7, 8):
+            if two_digit_optcode == 1:
+                result = values[0] + values[1]
+            elif two_digit_optcode == 2:
+                result = values[0] * values[1]
+            elif two_digit_optcode == 7:
+                result = (values[0] < values[1]).astype(np.int64)
+            else:
+                result = (values[0] == values[1]).astype(np.int64)
+            self._grow(int(addresses[2].max()) + 1)
+            self.memory[lanes, addresses[2]] = result
+
+        elif two_digit_optcode == 3:
+            has_input = np.array([bool(self.inputs[lane]) for lane in lanes], dtype=bool)
+            if not has_input.all():
+                # lanes which wait for input stop here
+                self._stop(lanes[~has_input], instruction_pointer)
+                lanes = lanes[has_input]
+                addresses[0] = addresses[0][has_input]
+                if not len(lanes):
+                    return []
+            invalid = addresses[0] < 0
+            if invalid.any():
+                self._stop(lanes[invalid], instruction_pointer, failed=True)
+                lanes = lanes[~invalid]
+                addresses[0] = addresses[0][~invalid]
+                if not len(lanes):
+                    return []
+            self._grow(int(addresses[0].max()) + 1)
+            self.memory[lanes, addresses[0]] = [self.inputs[lane].popleft() for lane in lanes]
+
+        elif two_digit_optcode == 4:
+            for lane, value in zip(lanes, values[0]):
+                self.outputs[lane].append(int(value))
+
+        elif two_digit_optcode in (5, 6):
+            jump = values[0] != 0 if two_digit_optcode == 5 else values[0] == 0
+            next_groups = []
+            if not jump.all():
+                next_groups.append((next_instruction_pointer, lanes[~jump]))
+            lanes = lanes[jump]
+            targets = parameters[1][jump]
+            if modes[1] != 1:
+                target_addresses = addresses[1][jump]
+                invalid = target_addresses < 0
+                if invalid.any():
+                    self._stop(lanes[invalid], instruction_pointer, failed=True)
+                    lanes = lanes[~invalid]
+                    target_addresses = target_addresses[~invalid]
+                targets = self._gather(lanes, target_addresses)
+            for target in np.unique(targets):
+                next_groups.append((int(target), lanes[targets == target]))
+            return next_groups
+
+        elif two_digit_optcode == 9:
+            self.relative_base[lanes] += values[0]
+
+        return [(next_instruction_pointer, lanes)]
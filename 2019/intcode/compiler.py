@@ -0,0 +1,178 @@
+# --- Compilation tier for the Intcode computer ---
+#
+# Straight-line runs of instructions (basic blocks) are translated into Python
+# functions, which run a whole block per call instead of dispatching each
+# instruction separately. A block ends at a jump (optcodes 5 and 6), and stops
+# before any instruction which may pause or stop the computer (optcodes 3, 4 and
+# 99) or which is not a valid instruction; those are left to the interpreter.
+#
+# Every address covered by a compiled block is watched, so that overwriting any
+# of its instructions or parameters throws the block away (and it is compiled
+# again from the new code the next time it runs). Writes inside a block which may
+# have hit the code always return to the dispatcher, so that a block never keeps
+# running code which has just been overwritten.
+from .computer import N_PARAMETERS, decode_handler
+
+# the optcodes which can be compiled
+COMPILED_OPTCODES = {1, 2, 5, 6, 7, 8, 9}
+
+# the expression computing the value written by each optcode with 3 parameters,
+# and the same operation on constants (to work out at compile time)
+OPERATIONS = {
+    1: "{0} + {1}",
+    2: "{0} * {1}",
+    7: "int({0} < {1})",
+    8: "int({0} == {1})",
+}
+FOLDED_OPERATIONS = {
+    1: lambda int1, int2: int1 + int2,
+    2: lambda int1, int2: int1 * int2,
+    7: lambda int1, int2: int(int1 < int2),
+    8: lambda int1, int2: int(int1 == int2),
+}
+
+
+def _load(name : str, parameter : int, mode : int, memory_size : int) -> tuple:
+    """Gets the lines which need to run before a parameter can be loaded, and the
+    expression giving its value (using the variable `name` if needed).
+    """
+    if mode == 1:    # mode 1 (immediate mode)
+        return [], str(parameter)
+    elif mode == 0:  # mode 0 (position mode)
+        # the memory never shrinks, so an address in range now is always in range
+        if 0 <= parameter < memory_size:
+            return [], f"memory[{parameter}]"
+        return [], f"read({parameter})"
+    else:            # mode 2 (relative mode)
+        return [f"address = {parameter} + relative_base",
+                f"{name} = memory[address] if 0 <= address < len(memory) else read(address)"], name
+
+
+def _store(parameter : int, mode : int, value : str, exit_address : int, memory_size : int) -> list:
+    """Gets the lines which write `value` to the address given by a parameter. If the
+    write has to go through the slow path (because the address is beyond the end of
+    the memory, or watched), the block returns to the dispatcher afterwards.
+    """
+    if mode == 0 and 0 <= parameter < memory_size:
+        lines = [f"address = {parameter}",
+                 "if address not in watched:"]
+    else:
+        if mode == 0:  # mode 0 (position mode)
+            lines = [f"address = {parameter}"]
+        else:          # mode 2 (relative mode)
+            lines = [f"address = {parameter} + relative_base"]
+        lines.append("if 0 <= address < len(memory) and address not in watched:")
+    return lines + [
+        f"    memory[address] = {value}",
+        "else:",
+        f"    write(address, {value})",
+        "    computer.relative_base = relative_base",
+        f"    return {exit_address}",
+    ]
+
+
+def compile_block(computer, start : int):
+    """Compiles the basic block starting at address `start` into a function, which
+    runs the block on the computer and returns the address of the next instruction.
+    Returns None if the instruction at `start` has to be interpreted.
+    """
+    memory = computer.memory
+    memory_size = len(memory)
+    lines = []
+    address = start
+    block_ended = False
+    always_jumps = False  # whether the block ends with a jump which is always taken
+    while not block_ended:
+        try:
+            instruction = computer.read(address)
+        except IndexError:
+            break
+        try:
+            _, modes = decode_handler(instruction=instruction, address=address)
+        except ValueError:
+            break  # left to the interpreter, which raises the error
+        two_digit_optcode = instruction % 100
+        if two_digit_optcode not in COMPILED_OPTCODES:
+            break  # left to the interpreter
+
+        n_parameters = N_PARAMETERS[two_digit_optcode]
+        parameters = [computer.read(address + idx + 1) for idx in range(n_parameters)]
+        next_address = address + n_parameters + 1
+        lines.append(f"# {address}: {instruction},{','.join(str(p) for p in parameters)}")
+
+        if two_digit_optcode in OPERATIONS:
+            setup1, int1 = _load("int1", parameters[0], modes[0], memory_size)
+            setup2, int2 = _load("int2", parameters[1], modes[1], memory_size)
+            value = OPERATIONS[two_digit_optcode].format(int1, int2)
+            if modes[0] == modes[1] == 1:  # both parameters are constants
+                value = str(FOLDED_OPERATIONS[two_digit_optcode](parameters[0], parameters[1]))
+            lines += setup1 + setup2
+            lines += _store(parameters[2], modes[2], value, next_address, memory_size)
+            # a block which overwrites its own code (at a fixed address) ends here
+            if modes[2] == 0 and start <= parameters[2] < next_address:
+                block_ended = True
+        elif two_digit_optcode == 9:
+            setup1, int1 = _load("int1", parameters[0], modes[0], memory_size)
+            lines += setup1 + [f"relative_base += {int1}"]
+        else:  # optcodes 5 and 6 (jumps) end the block
+            setup1, int1 = _load("int1", parameters[0], modes[0], memory_size)
+            setup2, int2 = _load("int2", parameters[1], modes[1], memory_size)
+            jump = ["computer.relative_base = relative_base", f"return {int2}"]
+            if modes[0] == 1:
+                # the condition is a constant, so the jump is either always or never taken
+                if bool(parameters[0]) == (two_digit_optcode == 5):
+                    lines += setup2 + jump
+                    always_jumps = True
+            else:
+                lines += setup1
+                lines.append(f"if {int1}:" if two_digit_optcode == 5 else f"if not {int1}:")
+                lines += ["    " + line for line in setup2 + jump]
+            block_ended = True
+
+        address = next_address
+
+    if address == start:
+        return None
+
+    # the memory (and the methods used) of a computer never change, so they are
+    # bound once when the block is compiled, rather than looked up on every run
+    source = "\n".join(
+        [f"def make_block(computer, memory, watched, read, write):",
+         f"    def block_{start}():",
+         "        relative_base = computer.relative_base"]
+        + ["        " + line for line in lines]
+        + ([] if always_jumps else ["        computer.relative_base = relative_base",
+                                      f"        return {address}"])
+        + [f"    return block_{start}"]
+    )
+    namespace = {}
+    exec(compile(source, f"<intcode block {start}>", "exec"), namespace)
+    block = namespace["make_block"](computer, memory, computer._watched,
+                                    computer.read, computer.write)
+    block.source = source
+
+    # watch the code of the block, so that the block is thrown away if overwritten
+    for covered_address in range(start, address):
+        computer._watched.add(covered_address)
+        computer._blocks_by_address.setdefault(covered_address, set()).add(start)
+
+    return block
+
+
+def run_compiled(computer) -> None:
+    """Runs the program from the current instruction, like `Intcode_computer.run`,
+    but running compiled blocks wherever possible.
+    """
+    blocks = computer._blocks
+    decode = computer.decode
+    instruction_pointer = computer.instruction_pointer
+    while instruction_pointer is not None:
+        try:
+            block = blocks[instruction_pointer]
+        except KeyError:
+            block = blocks[instruction_pointer] = compile_block(computer, instruction_pointer)
+        if block is None:
+            handler, modes = decode(instruction_pointer)
+            instruction_pointer = handler(computer, instruction_pointer, modes)
+        else:
+            instruction_pointer = block()
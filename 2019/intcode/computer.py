@@ -0,0 +1,601 @@
+# --- Intcode computer, shared by the 2019 Intcode puzzles ---
+from collections import deque
+from typing import Generator, Tuple
+import time
+from .memory import Forked_memory, Memory
+
+
+class Intcode_budget_exceeded(RuntimeError):
+    """Raised when a program runs for more steps or for longer than its budget.
+    """
+
+
+class Intcode_loop_detected(Intcode_budget_exceeded):
+    """Raised when a program is caught in an infinite loop, i.e. when the computer
+    comes back to the exact same state without any new input.
+    """
+
+
+def decode_instruction(instruction : int) -> Tuple[int, Tuple[int, int, int]]:
+    """Splits an instruction into its two-digit optcode and the modes of its three
+    parameters, e.g. 1002 -> (2, (0, 1, 0)).
+    """
+    two_digit_optcode = instruction % 100
+    modes = (instruction // 100 % 10,    # mode of the 1st parameter
+             instruction // 1000 % 10,   # mode of the 2nd parameter
+             instruction // 10000 % 10)  # mode of the 3rd parameter
+    return two_digit_optcode, modes
+
+
+# Each handler carries out one instruction and returns the address of the next
+# instruction, or None to stop. Parameters are fetched inline (rather than through
+# `read`) since this is where the computer spends nearly all of its time; only
+# addresses beyond the end of the memory, or overwrites of decoded instructions,
+# take the slow path through `read` and `write`.
+
+def _add(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    mode_of_1st_param, mode_of_2nd_param, mode_of_3rd_param = modes
+    int1 = memory[instruction_pointer + 1]
+    if mode_of_1st_param != 1:  # mode 0 (position mode) or 2 (relative mode)
+        if mode_of_1st_param:
+            int1 += computer.relative_base
+        int1 = memory[int1] if 0 <= int1 < len(memory) else computer.read(int1)
+    int2 = memory[instruction_pointer + 2]
+    if mode_of_2nd_param != 1:
+        if mode_of_2nd_param:
+            int2 += computer.relative_base
+        int2 = memory[int2] if 0 <= int2 < len(memory) else computer.read(int2)
+    new_address = memory[instruction_pointer + 3]
+    if mode_of_3rd_param:
+        new_address += computer.relative_base
+    if 0 <= new_address < len(memory) and new_address not in computer._watched:
+        memory[new_address] = int1 + int2
+    else:
+        computer.write(new_address, int1 + int2)
+    return instruction_pointer + 4
+
+
+def _multiply(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    mode_of_1st_param, mode_of_2nd_param, mode_of_3rd_param = modes
+    int1 = memory[instruction_pointer + 1]
+    if mode_of_1st_param != 1:
+        if mode_of_1st_param:
+            int1 += computer.relative_base
+        int1 = memory[int1] if 0 <= int1 < len(memory) else computer.read(int1)
+    int2 = memory[instruction_pointer + 2]
+    if mode_of_2nd_param != 1:
+        if mode_of_2nd_param:
+            int2 += computer.relative_base
+        int2 = memory[int2] if 0 <= int2 < len(memory) else computer.read(int2)
+    new_address = memory[instruction_pointer + 3]
+    if mode_of_3rd_param:
+        new_address += computer.relative_base
+    if 0 <= new_address < len(memory) and new_address not in computer._watched:
+        memory[new_address] = int1 * int2
+    else:
+        computer.write(new_address, int1 * int2)
+    return instruction_pointer + 4
+
+
+def _input(computer, instruction_pointer : int, modes : tuple) -> int:
+    if not computer.inputs:
+        # pause until an input value is provided
+        computer.instruction_pointer = instruction_pointer
+        return None
+    new_address = computer.memory[instruction_pointer + 1]
+    if modes[0]:
+        new_address += computer.relative_base
+    computer.write(new_address, computer.inputs.popleft())
+    return instruction_pointer + 2
+
+
+def _output(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    int1 = memory[instruction_pointer + 1]
+    if modes[0] != 1:
+        if modes[0]:
+            int1 += computer.relative_base
+        int1 = computer.read(int1)
+    computer.outputs.append(int1)
+    if computer.pause_on_output:
+        computer.instruction_pointer = instruction_pointer + 2
+        return None
+    return instruction_pointer + 2
+
+
+def _jump_if_true(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    mode_of_1st_param, mode_of_2nd_param, _ = modes
+    int1 = memory[instruction_pointer + 1]
+    if mode_of_1st_param != 1:
+        if mode_of_1st_param:
+            int1 += computer.relative_base
+        int1 = memory[int1] if 0 <= int1 < len(memory) else computer.read(int1)
+    if not int1:
+        return instruction_pointer + 3
+    int2 = memory[instruction_pointer + 2]
+    if mode_of_2nd_param != 1:
+        if mode_of_2nd_param:
+            int2 += computer.relative_base
+        int2 = memory[int2] if 0 <= int2 < len(memory) else computer.read(int2)
+    return int2
+
+
+def _jump_if_false(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    mode_of_1st_param, mode_of_2nd_param, _ = modes
+    int1 = memory[instruction_pointer + 1]
+    if mode_of_1st_param != 1:
+        if mode_of_1st_param:
+            int1 += computer.relative_base
+        int1 = memory[int1] if 0 <= int1 < len(memory) else computer.read(int1)
+    if int1:
+        return instruction_pointer + 3
+    int2 = memory[instruction_pointer + 2]
+    if mode_of_2nd_param != 1:
+        if mode_of_2nd_param:
+            int2 += computer.relative_base
+        int2 = memory[int2] if 0 <= int2 < len(memory) else computer.read(int2)
+    return int2
+
+
+def _less_than(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    mode_of_1st_param, mode_of_2nd_param, mode_of_3rd_param = modes
+    int1 = memory[instruction_pointer + 1]
+    if mode_of_1st_param != 1:
+        if mode_of_1st_param:
+            int1 += computer.relative_base
+        int1 = memory[int1] if 0 <= int1 < len(memory) else computer.read(int1)
+    int2 = memory[instruction_pointer + 2]
+    if mode_of_2nd_param != 1:
+        if mode_of_2nd_param:
+            int2 += computer.relative_base
+        int2 = memory[int2] if 0 <= int2 < len(memory) else computer.read(int2)
+    new_address = memory[instruction_pointer + 3]
+    if mode_of_3rd_param:
+        new_address += computer.relative_base
+    if 0 <= new_address < len(memory) and new_address not in computer._watched:
+        memory[new_address] = int(int1 < int2)
+    else:
+        computer.write(new_address, int(int1 < int2))
+    return instruction_pointer + 4
+
+
+def _equals(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    mode_of_1st_param, mode_of_2nd_param, mode_of_3rd_param = modes
+    int1 = memory[instruction_pointer + 1]
+    if mode_of_1st_param != 1:
+        if mode_of_1st_param:
+            int1 += computer.relative_base
+        int1 = memory[int1] if 0 <= int1 < len(memory) else computer.read(int1)
+    int2 = memory[instruction_pointer + 2]
+    if mode_of_2nd_param != 1:
+        if mode_of_2nd_param:
+            int2 += computer.relative_base
+        int2 = memory[int2] if 0 <= int2 < len(memory) else computer.read(int2)
+    new_address = memory[instruction_pointer + 3]
+    if mode_of_3rd_param:
+        new_address += computer.relative_base
+    if 0 <= new_address < len(memory) and new_address not in computer._watched:
+        memory[new_address] = int(int1 == int2)
+    else:
+        computer.write(new_address, int(int1 == int2))
+    return instruction_pointer + 4
+
+
+def _adjust_relative_base(computer, instruction_pointer : int, modes : tuple) -> int:
+    memory = computer.memory
+    int1 = memory[instruction_pointer + 1]
+    if modes[0] != 1:
+        if modes[0]:
+            int1 += computer.relative_base
+        int1 = memory[int1] if 0 <= int1 < len(memory) else computer.read(int1)
+    computer.relative_base += int1
+    return instruction_pointer + 2
+
+
+def _halt(computer, instruction_pointer : int, modes : tuple) -> int:
+    computer.instruction_pointer = instruction_pointer
+    computer.halted = True
+    return None
+
+
+def _execute_past_end(computer, instruction_pointer : int, modes : tuple) -> int:
+    """Carries out an instruction whose parameters run past the end of the memory
+    (where they hold 0), through `read` and `write` rather than by indexing the
+    memory like the other handlers. This is slow, but only ever needed for the last
+    few addresses of the memory.
+    """
+    two_digit_optcode = computer.read(instruction_pointer) % 100
+    n_parameters = N_PARAMETERS[two_digit_optcode]
+    parameters = [computer.read(instruction_pointer + idx + 1) for idx in range(n_parameters)]
+    next_instruction_pointer = instruction_pointer + n_parameters + 1
+
+    def _address(idx : int) -> int:
+        return parameters[idx] + (computer.relative_base if modes[idx] == 2 else 0)
+
+    def _value(idx : int) -> int:
+        return parameters[idx] if modes[idx] == 1 else computer.read(_address(idx))
+
+    if two_digit_optcode == 3:
+        if not computer.inputs:
+            # pause until an input value is provided
+            computer.instruction_pointer = instruction_pointer
+            return None
+        computer.write(_address(0), computer.inputs.popleft())
+    elif two_digit_optcode == 4:
+        computer.outputs.append(_value(0))
+        if computer.pause_on_output:
+            computer.instruction_pointer = next_instruction_pointer
+            return None
+    elif two_digit_optcode in (5, 6):
+        if bool(_value(0)) == (two_digit_optcode == 5):
+            return _value(1)
+    elif two_digit_optcode == 9:
+        computer.relative_base += _value(0)
+    else:  # optcodes 1, 2, 7 and 8
+        int1, int2 = _value(0), _value(1)
+        results = {1: int1 + int2, 2: int1 * int2, 7: int(int1 < int2), 8: int(int1 == int2)}
+        computer.write(_address(2), results[two_digit_optcode])
+    return next_instruction_pointer
+
+
+# dispatch table from optcode to the function which carries out the instruction
+HANDLERS = {
+    1: _add,
+    2: _multiply,
+    3: _input,
+    4: _output,
+    5: _jump_if_true,
+    6: _jump_if_false,
+    7: _less_than,
+    8: _equals,
+    9: _adjust_relative_base,
+    99: _halt,
+}
+
+# the number of parameters of each optcode
+N_PARAMETERS = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
+
+# which parameter (if any) each optcode writes to
+WRITE_PARAMETER = {1: 2, 2: 2, 3: 0, 7: 2, 8: 2}
+
+# decoded (and checked) instructions, by instruction; since the decoding only depends
+# on the instruction itself, this is shared by all computers
+_decoded_instructions = {}
+
+
+def decode_handler(instruction : int, address : int=None) -> tuple:
+    """Decodes an instruction into its handler and parameter modes, checking that it
+    is a valid instruction. The `address` is only used in the error messages.
+    """
+    try:
+        return _decoded_instructions[instruction]
+    except KeyError:
+        pass
+
+    two_digit_optcode, modes = decode_instruction(instruction)
+    try:
+        handler = HANDLERS[two_digit_optcode]
+    except KeyError:
+        raise ValueError(
+            f"Unknown optcode {two_digit_optcode} at address {address}."
+        ) from None
+    if any(mode not in (0, 1, 2) for mode in modes):
+        raise ValueError(f"Unknown parameter mode at address {address}.")
+    if two_digit_optcode in WRITE_PARAMETER:
+        # parameters that an instruction writes to will never be in immediate mode
+        if modes[WRITE_PARAMETER[two_digit_optcode]] == 1:
+            raise ValueError(f"Write parameter in immediate mode at address {address}.")
+
+    _decoded_instructions[instruction] = handler, modes
+    return handler, modes
+
+
+class Intcode_computer():
+    """A complete Intcode computer. Each instruction is decoded only once into its
+    handler and parameter modes, and the decoded instruction is cached by address
+    until that address is overwritten (i.e. by self-modifying code).
+
+    Example usage:
+    >> computer = Intcode_computer(memory=program, inputs=[1])
+    >> output = computer.run_program()
+    """
+    def __init__(self,
+                 memory : list,
+                 inputs : list=None,
+                 compiled : bool=False,
+                 max_steps : int=None,
+                 max_time : float=None,
+                 detect_loops : bool=False) -> None:
+        """Initializes Intcode computer. The program in `memory` is copied, so the
+        same program can be used to initialize several computers. If `compiled`, the
+        program is run by compiling it into Python functions one basic block at a
+        time (see `intcode.compiler`) instead of by the interpreter.
+
+        To guard against runaway programs, the computer can be given a budget of
+        `max_steps` instructions in total and/or `max_time` seconds per run, and can
+        `detect_loops`, raising `Intcode_budget_exceeded` (or `Intcode_loop_detected`)
+        when the program goes over. A computer with a budget is always interpreted.
+        """
+        self.memory = Memory(memory)
+        self.inputs = deque(inputs or [])
+        self.outputs = []
+        self.instruction_pointer = 0  # the address at the current instruction
+        self.relative_base = 0        # for mode 2 (relative mode)
+        self.halted = False
+        self.pause_on_output = False  # whether to stop running after each output
+        self.compiled = compiled
+        self.profiler = None          # see `intcode.profiler`
+        self.max_steps = max_steps
+        self.max_time = max_time
+        self.detect_loops = detect_loops
+        self.steps = 0                # instructions run, only counted with a budget
+        self._decoded = {}            # decoded instructions, by address
+        self._blocks = {}             # compiled blocks, by start address
+        self._blocks_by_address = {}  # start addresses of the compiled blocks, by address
+        # addresses which hold decoded or compiled code, and so need to be
+        # invalidated when overwritten
+        self._watched = set()
+
+    def read(self, address : int) -> int:
+        """Gets the value at the indicated memory address. Addresses beyond the end
+        of the memory hold 0.
+        """
+        return self.memory.read(address)
+
+    def write(self, address : int, value : int) -> None:
+        """Sets the value at the indicated memory address, growing the memory if
+        needed.
+        """
+        self.memory.write(address, value)
+        if address in self._watched:
+            self._invalidate(address)
+
+    def _invalidate(self, address : int) -> None:
+        """Forgets the decoded instruction and the compiled blocks which include the
+        indicated address, since it has been overwritten; the new code there will be
+        decoded (or compiled) again when it runs.
+        """
+        self._watched.discard(address)
+        self._decoded.pop(address, None)
+        self._blocks.pop(address, None)
+        for start in self._blocks_by_address.pop(address, ()):
+            self._blocks.pop(start, None)
+
+    def decode(self, address : int) -> tuple:
+        """Decodes the instruction at the indicated address into its handler and
+        parameter modes, using the cached decoding if there is one.
+        """
+        try:
+            return self._decoded[address]
+        except KeyError:
+            instruction = self.read(address)
+            handler, modes = decode_handler(instruction=instruction, address=address)
+            if address + N_PARAMETERS[instruction % 100] >= len(self.memory):
+                # the parameters run past the end of the memory, which the handlers
+                # do not check for; this is not cached, since the memory may grow
+                return _execute_past_end, modes
+            self._decoded[address] = handler, modes
+            self._watched.add(address)
+            return handler, modes
+
+    def predecode(self, disassembly) -> None:
+        """Decodes (and, if `compiled`, compiles) the code found by disassembling the
+        program ahead of time (see `intcode.disassembler`), e.g. from a disassembly
+        cached by an earlier run, so that it is not decoded as it is first reached.
+        Instructions which no longer match the memory are skipped.
+        """
+        for block in disassembly.blocks.values():
+            for address, instruction, parameters in block.instructions:
+                if (address not in self._decoded and self.read(address) == instruction
+                        and address + len(parameters) < len(self.memory)):
+                    self._decoded[address] = decode_handler(instruction=instruction,
+                                                            address=address)
+                    self._watched.add(address)
+            if self.compiled and block.start not in self._blocks:
+                self._blocks[block.start] = compile_block(self, block.start)
+
+    def run(self) -> None:
+        """Runs the program from the current instruction until it halts (optcode
+        99) or needs an input value which has not been provided yet (or, if
+        `pause_on_output` is set, until it outputs a value).
+        """
+        if self.max_steps is not None or self.max_time is not None or self.detect_loops:
+            return self._run_within_budget()
+        if self.profiler is not None:
+            return self.profiler.run(self)
+        if self.compiled:
+            return run_compiled(self)
+
+        decoded = self._decoded
+        decode = self.decode
+        instruction_pointer = self.instruction_pointer
+        while instruction_pointer is not None:
+            try:
+                handler, modes = decoded[instruction_pointer]
+            except KeyError:
+                handler, modes = decode(instruction_pointer)
+            instruction_pointer = handler(self, instruction_pointer, modes)
+
+    def _run_within_budget(self) -> None:
+        """Runs the program like `run`, but counting the steps, and checking every
+        `BUDGET_CHECK_INTERVAL` steps that the program is within its budget and (if
+        `detect_loops` is set) has not come back to a state it was in before. If the
+        computer has a profiler, every instruction is recorded by it too.
+        """
+        start_time = time.perf_counter()
+        try:
+            self._run_budget_checks(start_time)
+        finally:
+            if self.profiler is not None:
+                self.profiler.wall_time += time.perf_counter() - start_time
+
+    def _run_budget_checks(self, start_time : float) -> None:
+        decoded = self._decoded
+        decode = self.decode
+        profiler = self.profiler
+        deadline = None if self.max_time is None else start_time + self.max_time
+        # loops are detected with Brent's algorithm, on the states at each check
+        saved_state = saved_memory = None
+        power = n_checks = 1
+        instruction_pointer = self.instruction_pointer
+        while instruction_pointer is not None:
+            n_steps = BUDGET_CHECK_INTERVAL
+            if self.max_steps is not None:
+                n_steps = min(n_steps, self.max_steps - self.steps)
+                if n_steps <= 0:
+                    self.instruction_pointer = instruction_pointer
+                    raise Intcode_budget_exceeded(
+                        f"Program ran for more than {self.max_steps} steps."
+                    )
+
+            steps = 0
+            if profiler is not None:
+                while instruction_pointer is not None and steps < n_steps:
+                    instruction_pointer = profiler.step(self, instruction_pointer)
+                    steps += 1
+            else:
+                while instruction_pointer is not None and steps < n_steps:
+                    try:
+                        handler, modes = decoded[instruction_pointer]
+                    except KeyError:
+                        handler, modes = decode(instruction_pointer)
+                    instruction_pointer = handler(self, instruction_pointer, modes)
+                    steps += 1
+            self.steps += steps
+            if instruction_pointer is None:
+                break
+
+            self.instruction_pointer = instruction_pointer
+            if deadline is not None and time.perf_counter() > deadline:
+                raise Intcode_budget_exceeded(
+                    f"Program ran for more than {self.max_time} seconds."
+                )
+            if self.detect_loops:
+                # the memory is only compared (and copied) when the rest of the state
+                # matches, or when a new state is saved, so most checks are cheap
+                state = (instruction_pointer, self.relative_base, len(self.inputs))
+                if state == saved_state and list(self.memory) == saved_memory:
+                    raise Intcode_loop_detected(
+                        f"Program is in an infinite loop (at address {instruction_pointer})."
+                    )
+                if power == n_checks:
+                    saved_state = state
+                    saved_memory = list(self.memory)
+                    power *= 2
+                    n_checks = 0
+                n_checks += 1
+
+    def run_program(self, input_value : int=None) -> list:
+        """Runs an intcode program, optionally providing one more input value, and
+        returns all the values output so far.
+        """
+        if input_value is not None:
+            self.inputs.append(input_value)
+        self.run()
+        return self.outputs
+
+    def snapshot(self) -> "Intcode_snapshot":
+        """Takes a snapshot of the current state of the computer, which can then be
+        forked any number of times.
+        """
+        return Intcode_snapshot(computer=self)
+
+    def run_generator(self) -> Generator[int, int, None]:
+        """Runs an intcode program as a coroutine, which yields each value as soon
+        as it is output. Whenever the program needs an input value which has not
+        been provided yet, it yields None instead. Values sent into the coroutine
+        are added to the inputs, so several computers can be chained together e.g.
+
+        >> amplifier = Intcode_computer(memory=program, inputs=[phase_setting]).run_generator()
+        >> next(amplifier)                      # None, waiting for the input signal
+        >> output = amplifier.send(input_value)
+        """
+        self.pause_on_output = True
+        try:
+            while not self.halted:
+                n_outputs = len(self.outputs)
+                self.run()
+                if len(self.outputs) > n_outputs:
+                    input_value = yield self.outputs[-1]
+                elif not self.halted:  # waiting for an input value
+                    input_value = yield None
+                else:
+                    break
+                if input_value is not None:
+                    self.inputs.append(input_value)
+        finally:
+            self.pause_on_output = False
+
+
+# the number of steps between checks of the budget of a computer
+BUDGET_CHECK_INTERVAL = 1000
+
+# the size (in addresses) from which forks share their memory image copy-on-write
+COPY_ON_WRITE_MIN_SIZE = 4096
+
+
+class Intcode_snapshot():
+    """A frozen copy of the state of an Intcode computer. Forking a snapshot gives a
+    new computer which starts from that state; the memory image is shared by all the
+    forks and copied on write (see `Forked_memory`), so a fork costs nothing up front
+    and each run only pays for the addresses it writes. Memory images smaller than
+    `COPY_ON_WRITE_MIN_SIZE` are simply copied into each fork instead.
+
+    Example usage:
+    >> snapshot = Intcode_computer(memory=program).snapshot()
+    >> computer = snapshot.fork()
+    >> computer.write(address=1, value=noun)
+    >> computer.run()
+    """
+    def __init__(self, computer : Intcode_computer) -> None:
+        """Takes a snapshot of the state of `computer`.
+        """
+        self.memory = tuple(computer.memory)
+        self.inputs = tuple(computer.inputs)
+        self.outputs = tuple(computer.outputs)
+        self.instruction_pointer = computer.instruction_pointer
+        self.relative_base = computer.relative_base
+        self.halted = computer.halted
+        self.compiled = computer.compiled
+        self.max_steps = computer.max_steps
+        self.max_time = computer.max_time
+        self.detect_loops = computer.detect_loops
+        self.steps = computer.steps
+        self._decoded = dict(computer._decoded)
+
+    def fork(self, inputs : list=None) -> Intcode_computer:
+        """Creates a new computer in the state of the snapshot, optionally with some
+        more input values.
+        """
+        computer = Intcode_computer(memory=())
+        if len(self.memory) >= COPY_ON_WRITE_MIN_SIZE:
+            computer.memory = Forked_memory(base=self.memory)
+        else:
+            # copying a small memory image outright is cheaper than reading it
+            # through the write log of a `Forked_memory`
+            computer.memory = Memory(self.memory)
+        computer.inputs.extend(self.inputs)
+        computer.inputs.extend(inputs or [])
+        computer.outputs.extend(self.outputs)
+        computer.instruction_pointer = self.instruction_pointer
+        computer.relative_base = self.relative_base
+        computer.halted = self.halted
+        # the instructions decoded so far are still valid in the fork until overwritten
+        computer._decoded = dict(self._decoded)
+        computer._watched = set(self._decoded)
+        computer.compiled = self.compiled
+        computer.max_steps = self.max_steps
+        computer.max_time = self.max_time
+        computer.detect_loops = self.detect_loops
+        computer.steps = self.steps
+        return computer
+
+
+# imported last, since the compiler builds on the decoding above
+from .compiler import compile_block, run_compiled
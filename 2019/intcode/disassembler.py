@@ -0,0 +1,212 @@
+# --- Static disassembly of Intcode programs into basic blocks ---
+#
+# The program is walked from its entry points, following every jump whose target
+# is known statically (i.e. given in immediate mode), and split into basic blocks:
+# straight-line runs of instructions which end at a jump (optcodes 5 and 6), a halt
+# (optcode 99) or an invalid instruction, or just before an instruction which some
+# jump lands on. Addresses not covered by any instruction reached this way are data.
+# Code which is only reached through jumps to computed addresses (or which the
+# program writes at run time) cannot be found statically, and also counts as data.
+from typing import Iterable
+import hashlib
+import json
+import os
+
+from .computer import N_PARAMETERS, decode_handler
+
+MNEMONICS = {1: "add", 2: "mul", 3: "in", 4: "out", 5: "jnz", 6: "jz", 7: "lt", 8: "eq",
+             9: "arb", 99: "hlt"}
+
+
+class Basic_block():
+    """A straight-line run of instructions, each given as (address, instruction,
+    parameters), with the start addresses of the blocks which may run after it.
+    `dynamic_jump` is set if the block ends with a jump to a computed address.
+    """
+    def __init__(self, start : int, instructions : list, successors : list,
+                 dynamic_jump : bool=False) -> None:
+        self.start = start
+        self.instructions = instructions
+        self.successors = successors
+        self.dynamic_jump = dynamic_jump
+
+    @property
+    def end(self) -> int:
+        """The address just after the last instruction of the block.
+        """
+        address, _, parameters = self.instructions[-1]
+        return address + len(parameters) + 1
+
+
+class Disassembly():
+    """The basic blocks of an Intcode program, by start address, and the addresses
+    which hold code (instructions and their parameters) or data.
+
+    Example usage:
+    >> disassembly = disassemble(program)
+    >> print(disassembly.listing())
+    """
+    def __init__(self, program : list, blocks : dict) -> None:
+        self.size = len(program)
+        self.blocks = blocks
+        self.code_addresses = {address + offset
+                               for block in blocks.values()
+                               for address, _, parameters in block.instructions
+                               for offset in range(len(parameters) + 1)}
+
+    @property
+    def data_addresses(self) -> list:
+        """The addresses of the program which are not (statically reachable) code.
+        """
+        return [address for address in range(self.size) if address not in self.code_addresses]
+
+    def listing(self) -> str:
+        """Gets a human-readable listing of the code, one block after the other.
+        """
+        lines = []
+        for start in sorted(self.blocks):
+            block = self.blocks[start]
+            successors = ", ".join(str(successor) for successor in block.successors)
+            if block.dynamic_jump:
+                successors += " (and computed jump)"
+            lines.append(f"block {start}-{block.end - 1} -> {successors or '-'}")
+            for address, instruction, parameters in block.instructions:
+                _, modes = decode_handler(instruction=instruction, address=address)
+                operands = [_format_parameter(parameter, mode)
+                            for parameter, mode in zip(parameters, modes)]
+                lines.append(f"{address:>6}: {MNEMONICS[instruction % 100]:<4}{' '.join(operands)}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "size": self.size,
+            "blocks": [[block.start, block.instructions, block.successors, block.dynamic_jump]
+                       for block in self.blocks.values()],
+        })
+
+    @classmethod
+    def from_json(cls, program : list, text : str) -> "Disassembly":
+        data = json.loads(text)
+        blocks = {}
+        for start, instructions, successors, dynamic_jump in data["blocks"]:
+            instructions = [(address, instruction, tuple(parameters))
+                            for address, instruction, parameters in instructions]
+            blocks[start] = Basic_block(start, instructions, successors, dynamic_jump)
+        return cls(program=program, blocks=blocks)
+
+
+def _format_parameter(parameter : int, mode : int) -> str:
+    if mode == 0:    # mode 0 (position mode)
+        return f"[{parameter}]"
+    elif mode == 1:  # mode 1 (immediate mode)
+        return str(parameter)
+    else:            # mode 2 (relative mode)
+        return f"[rb{parameter:+d}]"
+
+
+def disassemble(program : list, entry_points : Iterable[int]=(0,)) -> Disassembly:
+    """Splits the code of the program which is reachable from the entry points into
+    basic blocks.
+    """
+    # first, find every instruction reachable from the entry points, and the
+    # addresses where blocks start (entry points, jump targets and fall-throughs)
+    instructions = {}  # by address
+    successors = {}    # of the instructions ending a block, by address
+    leaders = set(entry_points)
+    to_visit = list(entry_points)
+    while to_visit:
+        address = to_visit.pop()
+        while 0 <= address < len(program):
+            if address in instructions:
+                # joins code found before, so a block must start here
+                leaders.add(address)
+                break
+            instruction = program[address]
+            try:
+                decode_handler(instruction=instruction, address=address)
+            except ValueError:
+                break  # the program would fail here, if it ever runs this
+            two_digit_optcode = instruction % 100
+            n_parameters = N_PARAMETERS[two_digit_optcode]
+            parameters = tuple(program[address + idx + 1] if address + idx + 1 < len(program) else 0
+                               for idx in range(n_parameters))
+            instructions[address] = instruction, parameters
+            next_address = address + n_parameters + 1
+
+            if two_digit_optcode == 99:
+                successors[address] = []
+                break
+            if two_digit_optcode in (5, 6):
+                _, modes = decode_handler(instruction=instruction, address=address)
+                targets = []
+                # a condition in immediate mode always (or never) jumps
+                if modes[0] != 1 or bool(parameters[0]) != (two_digit_optcode == 5):
+                    targets.append(next_address)
+                if modes[0] != 1 or bool(parameters[0]) == (two_digit_optcode == 5):
+                    # only a target in immediate mode is known statically
+                    targets.append(parameters[1] if modes[1] == 1 else None)
+                successors[address] = targets
+                for target in targets:
+                    if target is not None:
+                        leaders.add(target)
+                        to_visit.append(target)
+                break
+            address = next_address
+
+    # then, split the instructions into blocks, each running from a leader until
+    # the next leader or the end of the straight-line code
+    blocks = {}
+    for start in sorted(leaders):
+        if start not in instructions:
+            continue
+        block_instructions = []
+        address = start
+        while True:
+            instruction, parameters = instructions[address]
+            block_instructions.append((address, instruction, parameters))
+            next_address = address + len(parameters) + 1
+            if address in successors:
+                targets = successors[address]
+                break
+            if next_address in leaders or next_address not in instructions:
+                # falls through into the next block (or into an invalid instruction)
+                targets = [next_address]
+                break
+            address = next_address
+        blocks[start] = Basic_block(start=start,
+                                    instructions=block_instructions,
+                                    successors=[target for target in targets if target is not None],
+                                    dynamic_jump=None in targets)
+    return Disassembly(program=program, blocks=blocks)
+
+
+def load_disassembly(program : list,
+                     entry_points : Iterable[int]=(0,),
+                     cache_dir : str=None) -> Disassembly:
+    """Gets the disassembly of a program, from the cache in `cache_dir` if the same
+    program has been disassembled before (the cache is keyed by a hash of the program
+    and the entry points), or else disassembles it and saves it in the cache.
+    """
+    entry_points = tuple(entry_points)
+    if cache_dir is None:
+        return disassemble(program=program, entry_points=entry_points)
+
+    key = hashlib.sha256(
+        (",".join(map(str, program)) + ";" + ",".join(map(str, entry_points))).encode()
+    ).hexdigest()
+    path = os.path.join(cache_dir, f"{key}.disassembly.json")
+    try:
+        with open(path, "r") as cached:
+            return Disassembly.from_json(program=program, text=cached.read())
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # not cached yet (or unreadable), so disassemble it again
+
+    disassembly = disassemble(program=program, entry_points=entry_points)
+    os.makedirs(cache_dir, exist_ok=True)
+    # write to a temporary file first, so that the cache is never left half-written
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as cached:
+        cached.write(disassembly.to_json())
+    os.replace(temporary_path, path)
+    return disassembly
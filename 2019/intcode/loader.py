@@ -0,0 +1,75 @@
+# --- Loading Intcode programs, with a binary cache of the parsed program ---
+from array import array
+import hashlib
+import mmap
+import os
+import struct
+
+# the header of a cached program: the modification time (in ns) and size of the
+# input file it was parsed from, and the SHA-256 digest of its contents
+_HEADER = struct.Struct("<qq32s")
+
+
+def parse_program(text : bytes) -> list:
+    """Parses the comma-separated values of an Intcode program (ignoring whitespace
+    around them, such as the trailing newline).
+    """
+    return [int(value) for value in text.split(b",") if value.strip()]
+
+
+def load_program(path : str="input", cache_dir : str=".intcode-cache") -> list:
+    """Loads an Intcode program from a file of comma-separated values.
+
+    The parsed program is cached in `cache_dir` (unless it is None) as an array of
+    64-bit integers, keyed on the modification time and the contents of the input
+    file: if the file has not been modified since it was cached, it is not even read,
+    and if it was modified but has the same contents, it is not parsed again.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    if cache_dir is None:
+        with open(path, "rb") as input_data:
+            return parse_program(input_data.read())
+
+    modification_time = os.stat(path).st_mtime_ns
+    cache_key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{cache_key}.program")
+    cached_digest = None
+    try:
+        with open(cache_path, "rb") as cached:
+            cached_time, cached_size, cached_digest = _HEADER.unpack(cached.read(_HEADER.size))
+            if (cached_time, cached_size) == (modification_time, size):
+                return _read_values(cached)
+    except (OSError, struct.error, ValueError):
+        cached_digest = None  # not cached yet (or unreadable)
+
+    with open(path, "rb") as input_data, \
+         mmap.mmap(input_data.fileno(), 0, access=mmap.ACCESS_READ) as text:
+        digest = hashlib.sha256(text).digest()
+        if digest == cached_digest:
+            # the file was touched, but its contents did not change
+            with open(cache_path, "rb") as cached:
+                cached.seek(_HEADER.size)
+                program = _read_values(cached)
+        else:
+            program = parse_program(text[:])
+
+    try:
+        values = array("q", program)
+    except OverflowError:
+        return program  # values beyond 64 bits are not cached
+    os.makedirs(cache_dir, exist_ok=True)
+    # write to a temporary file first, so that the cache is never left half-written
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as cached:
+        cached.write(_HEADER.pack(modification_time, size, digest))
+        values.tofile(cached)
+    os.replace(temporary_path, cache_path)
+    return program
+
+
+def _read_values(cached) -> list:
+    values = array("q")
+    values.frombytes(cached.read())
+    return values.tolist()
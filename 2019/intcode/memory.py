@@ -0,0 +1,91 @@
+# --- Flat, growable memory for the Intcode computer ---
+
+
+class Memory(list):
+    """The memory of an Intcode computer, stored as one contiguous list of values.
+
+    Indexing works exactly like a list (so the computer can read its parameters
+    without any method call), while `read` and `write` handle the addresses beyond
+    the current end of the memory: reads there return 0 without allocating anything,
+    and writes grow the memory geometrically so that a program which keeps writing
+    a little further out (e.g. its stack, in relative mode) is not copied every time.
+
+    Example usage:
+    >> memory = Memory(program)
+    >> memory.write(address=10000, value=1)
+    >> value = memory.read(address=20000)  # 0
+    """
+    def read(self, address : int) -> int:
+        """Gets the value at the indicated memory address. Addresses beyond the end
+        of the memory hold 0.
+        """
+        if address < 0:
+            raise IndexError(f"Invalid (negative) memory address {address}.")
+        if address >= len(self):
+            return 0
+        return self[address]
+
+    def write(self, address : int, value : int) -> None:
+        """Sets the value at the indicated memory address, growing the memory if
+        needed.
+        """
+        if address < 0:
+            raise IndexError(f"Invalid (negative) memory address {address}.")
+        if address >= len(self):
+            # at least double the size, so that the cost of growing is amortized
+            new_size = max(address + 1, 2 * len(self))
+            self.extend([0] * (new_size - len(self)))
+        self[address] = value
+
+
+class Forked_memory():
+    """A copy-on-write view of a memory image which is shared between forks of an
+    Intcode computer. The shared image is never modified; instead, the values written
+    by this fork are kept in a log which overlays it, so that creating a fork costs
+    nothing and a fork only pays for the addresses it actually writes.
+
+    Supports the same indexing, `len`, `read` and `write` as `Memory`.
+    """
+    def __init__(self, base : tuple) -> None:
+        self.base = base   # the shared memory image
+        self.writes = {}   # the values written by this fork, by address
+        self._size = len(base)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        for address in range(self._size):
+            yield self[address]
+
+    def __getitem__(self, address : int) -> int:
+        if 0 <= address < len(self.base):
+            return self.writes.get(address, self.base[address])
+        if not 0 <= address < self._size:
+            raise IndexError(f"Memory address {address} out of range.")
+        return self.writes.get(address, 0)
+
+    def __setitem__(self, address : int, value : int) -> None:
+        if not 0 <= address < self._size:
+            raise IndexError(f"Memory address {address} out of range.")
+        self.writes[address] = value
+
+    def read(self, address : int) -> int:
+        """Gets the value at the indicated memory address. Addresses beyond the end
+        of the memory hold 0.
+        """
+        if address < 0:
+            raise IndexError(f"Invalid (negative) memory address {address}.")
+        if address >= self._size:
+            return 0
+        return self[address]
+
+    def write(self, address : int, value : int) -> None:
+        """Sets the value at the indicated memory address, growing the memory if
+        needed (which only moves its end, since nothing is allocated).
+        """
+        if address < 0:
+            raise IndexError(f"Invalid (negative) memory address {address}.")
+        if address >= self._size:
+            self._size = address + 1
+        self.writes[address] = value
@@ -0,0 +1,197 @@
+# --- Networks of Intcode computers, run cooperatively with asyncio ---
+from collections import deque
+from typing import Callable
+import asyncio
+
+from .computer import Intcode_computer
+
+
+class Intcode_machine():
+    """An Intcode computer in a network, with a bounded inbox for its input values.
+    Its output values are grouped into packets of `packet_size` values, and `route`
+    maps each packet to the name of the machine it is sent to and the values sent.
+    """
+    def __init__(self, name : str, computer : Intcode_computer, packet_size : int,
+                 route : Callable) -> None:
+        self.name = name
+        self.computer = computer
+        self.packet_size = packet_size
+        self.route = route
+        self.inbox = None        # created when the network runs, in its event loop
+        self.pending = []        # input values sent before the network runs
+        self.packet = []         # output values not grouped into a packet yet
+        self.outbox = None       # (destination, values) of the packet being sent
+        self.blocked_on = None   # "get" or "put" while waiting on a full/empty inbox
+        self.destination = None  # set by `Intcode_network.connect`
+
+
+class Intcode_network():
+    """A network of Intcode computers which exchange values (or packets of values)
+    through bounded channels, e.g. a ring of amplifiers or a cluster of machines
+    sending packets to each other. Each computer runs as an asyncio task in a single
+    thread, and gives way to the others whenever it waits for input and after every
+    output, so the machines which are ready to run take turns (round-robin).
+
+    The network runs until every computer halts, or until it is idle: every computer
+    which has not halted waits on an empty inbox (or on a full one). Values sent to a
+    computer which has halted are dropped.
+
+    Example usage:
+    >> network = Intcode_network(channel_size=16)
+    >> for name, phase_setting in zip("ABCDE", phase_settings):
+    >>     network.add_machine(name, program, inputs=[phase_setting])
+    >> for source, destination in zip("ABCDE", "BCDEA"):
+    >>     network.connect(source, destination)
+    >> network.send("A", 0)
+    >> network.run()
+    >> signal = network.machines["E"].computer.outputs[-1]
+    """
+    def __init__(self, channel_size : int=64) -> None:
+        self.channel_size = channel_size  # the size of the inbox of each machine
+        self.machines = {}
+        self.idle = False                 # whether the last run stopped as idle
+        self._n_blocked = 0
+        self._idle_event = None
+
+    def add_machine(self,
+                    name : str,
+                    program : list,
+                    inputs : list=None,
+                    packet_size : int=1,
+                    route : Callable=None,
+                    **computer_options) -> Intcode_machine:
+        """Adds a computer running `program` to the network. By default, each output
+        value is sent to the machine it is connected to (see `connect`); otherwise,
+        `route(packet)` gets the name of the machine that a packet of `packet_size`
+        output values is sent to, and the list of values to send. Packets routed to
+        None (e.g. the output of a machine which is not connected) are not sent
+        anywhere, and are only kept in the `outputs` of its computer.
+        """
+        computer = Intcode_computer(memory=program, inputs=inputs, **computer_options)
+        machine = Intcode_machine(name=name,
+                                  computer=computer,
+                                  packet_size=packet_size,
+                                  route=route or (lambda packet: (machine.destination, packet)))
+        self.machines[name] = machine
+        return machine
+
+    def connect(self, source : str, destination : str) -> None:
+        """Sends the output of the `source` machine to the `destination` machine.
+        """
+        self.machines[source].destination = destination
+
+    def send(self, name : str, value : int) -> None:
+        """Sends an input value to a machine from outside the network (before it runs).
+        """
+        self.machines[name].pending.append(value)
+
+    def run(self) -> None:
+        """Runs the network until every computer halts or the network is idle.
+        """
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        self.idle = False
+        self._n_blocked = 0
+        self._idle_event = asyncio.Event()
+        for machine in self.machines.values():
+            machine.inbox = asyncio.Queue(maxsize=max(self.channel_size, len(machine.pending)))
+            for value in machine.pending:
+                machine.inbox.put_nowait(value)
+            machine.pending = []
+
+        tasks = {asyncio.create_task(self._run_machine(machine))
+                 for machine in self.machines.values()}
+        idle = asyncio.create_task(self._idle_event.wait())
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks | {idle}, return_when=asyncio.FIRST_COMPLETED)
+                for task in done - {idle}:
+                    task.result()  # raises any error from the computer
+                tasks -= done
+                if idle in done:
+                    self.idle = True
+                    break
+        finally:
+            for task in tasks | {idle}:
+                task.cancel()
+            await asyncio.gather(*tasks, idle, return_exceptions=True)
+            # keep the values which were not received yet, for the next run
+            for machine in self.machines.values():
+                while not machine.inbox.empty():
+                    machine.pending.append(machine.inbox.get_nowait())
+                machine.blocked_on = None
+
+    async def _run_machine(self, machine : Intcode_machine) -> None:
+        computer = machine.computer
+        computer.pause_on_output = True
+        try:
+            if machine.outbox is not None:  # a packet left over from the last run
+                await self._send_packet(machine)
+            while True:
+                n_outputs = len(computer.outputs)
+                computer.run()
+                if len(computer.outputs) > n_outputs:
+                    machine.packet.append(computer.outputs[-1])
+                    if len(machine.packet) == machine.packet_size:
+                        name, values = machine.route(machine.packet)
+                        machine.packet = []
+                        if name is not None:  # else, only kept in `computer.outputs`
+                            machine.outbox = (name, deque(values))
+                            await self._send_packet(machine)
+                    await asyncio.sleep(0)  # give way to the other machines
+                elif computer.halted:
+                    break
+                else:  # waiting for an input value
+                    computer.inputs.append(await self._receive(machine))
+        finally:
+            computer.pause_on_output = False
+        self._check_idle()  # one less machine running
+
+    async def _receive(self, machine : Intcode_machine) -> int:
+        if not machine.inbox.empty():
+            return machine.inbox.get_nowait()
+        machine.blocked_on = "get"
+        self._n_blocked += 1
+        self._check_idle()
+        try:
+            return await machine.inbox.get()
+        finally:
+            machine.blocked_on = None
+            self._n_blocked -= 1
+
+    async def _send_packet(self, machine : Intcode_machine) -> None:
+        name, values = machine.outbox
+        destination = self.machines[name]
+        while values and not destination.computer.halted:
+            if destination.inbox.full():
+                machine.blocked_on = "put"
+                self._n_blocked += 1
+                self._check_idle()
+                try:
+                    await destination.inbox.put(values[0])
+                finally:
+                    machine.blocked_on = None
+                    self._n_blocked -= 1
+            else:
+                destination.inbox.put_nowait(values[0])
+            values.popleft()
+        machine.outbox = None
+
+    def _check_idle(self) -> None:
+        """Flags the network as idle if every machine which is still running is
+        waiting on an empty inbox, or on a full one. (A machine whose inbox is no
+        longer empty, or full, is about to run again.)
+        """
+        running = [machine for machine in self.machines.values()
+                   if not machine.computer.halted]
+        if not running or self._n_blocked < len(running):
+            return
+        for machine in running:
+            if machine.blocked_on == "get" and not machine.inbox.empty():
+                return
+            if machine.blocked_on == "put":
+                name, _ = machine.outbox
+                if not self.machines[name].inbox.full():
+                    return
+        self._idle_event.set()
@@ -0,0 +1,112 @@
+# --- Execution profiler for the Intcode computer ---
+from collections import Counter
+import json
+import time
+
+from .computer import N_PARAMETERS
+
+INSTRUCTION_NAMES = {
+    1: "add",
+    2: "multiply",
+    3: "input",
+    4: "output",
+    5: "jump-if-true",
+    6: "jump-if-false",
+    7: "less than",
+    8: "equals",
+    9: "adjust relative base",
+    99: "halt",
+}
+
+MODE_NAMES = {0: "position", 1: "immediate", 2: "relative"}
+
+
+class Intcode_profiler():
+    """Records where an Intcode program spends its time: the number of instructions
+    executed by optcode, by address and by parameter mode, the total number of steps
+    and the wall time. Profiling is opt-in, since every instruction is recorded (and
+    interpreted, even if the computer is set to run compiled). A computer with a
+    budget (see `Intcode_computer.max_steps`) still keeps to it while profiled.
+
+    Example usage:
+    >> profiler = Intcode_profiler()
+    >> computer = Intcode_computer(memory=program, inputs=[2])
+    >> computer.profiler = profiler
+    >> computer.run()
+    >> print(profiler.report())
+    """
+    def __init__(self) -> None:
+        self.steps = 0                  # the number of instructions executed
+        self.wall_time = 0.0            # in seconds
+        self.by_optcode = Counter()     # instructions executed, by optcode
+        self.by_address = Counter()     # instructions executed, by address
+        self.by_mode = Counter()        # parameters fetched, by mode
+        self.optcode_at_address = {}    # the (last) optcode executed at each address
+
+    def run(self, computer) -> None:
+        """Runs the program on `computer`, like `Intcode_computer.run`, recording
+        every instruction executed.
+        """
+        start_time = time.perf_counter()
+        instruction_pointer = computer.instruction_pointer
+        try:
+            while instruction_pointer is not None:
+                instruction_pointer = self.step(computer, instruction_pointer)
+        finally:
+            self.wall_time += time.perf_counter() - start_time
+
+    def step(self, computer, instruction_pointer : int) -> int:
+        """Runs the instruction at `instruction_pointer` on `computer` and records it
+        (unless it is an input instruction still waiting for its input), returning the
+        address of the next instruction, or None if the program stops there.
+        """
+        handler, modes = computer.decode(instruction_pointer)
+        two_digit_optcode = computer.read(instruction_pointer) % 100
+        next_instruction_pointer = handler(computer, instruction_pointer, modes)
+
+        # an input instruction which is waiting for its input did not run yet
+        if not (two_digit_optcode == 3 and next_instruction_pointer is None):
+            self.steps += 1
+            self.by_optcode[two_digit_optcode] += 1
+            self.by_address[instruction_pointer] += 1
+            self.optcode_at_address[instruction_pointer] = two_digit_optcode
+            for mode in modes[:N_PARAMETERS[two_digit_optcode]]:
+                self.by_mode[mode] += 1
+        return next_instruction_pointer
+
+    def report(self, n_addresses : int=10) -> str:
+        """Gets a report of the instructions executed by optcode and parameter mode,
+        and the `n_addresses` hottest addresses.
+        """
+        steps = max(self.steps, 1)
+        lines = [f"{self.steps} steps in {self.wall_time:.3f} s", "",
+                 "optcode  instruction            count   share"]
+        for two_digit_optcode, count in self.by_optcode.most_common():
+            name = INSTRUCTION_NAMES.get(two_digit_optcode, "?")
+            lines.append(f"{two_digit_optcode:>7}  {name:<20} {count:>7} {count / steps:>7.1%}")
+
+        n_parameters = max(sum(self.by_mode.values()), 1)
+        lines += ["", "mode  name                   count   share"]
+        for mode, count in sorted(self.by_mode.items()):
+            lines.append(f"{mode:>4}  {MODE_NAMES[mode]:<20} {count:>7} {count / n_parameters:>7.1%}")
+
+        lines += ["", "address  instruction            count   share"]
+        for address, count in self.by_address.most_common(n_addresses):
+            name = INSTRUCTION_NAMES.get(self.optcode_at_address[address], "?")
+            lines.append(f"{address:>7}  {name:<20} {count:>7} {count / steps:>7.1%}")
+
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        """Gets the profile as a JSON string, with the hottest addresses first.
+        """
+        return json.dumps({
+            "steps": self.steps,
+            "wall_time": self.wall_time,
+            "by_optcode": {str(optcode): count for optcode, count in self.by_optcode.most_common()},
+            "by_mode": {MODE_NAMES[mode]: count for mode, count in sorted(self.by_mode.items())},
+            "by_address": [{"address": address,
+                            "optcode": self.optcode_at_address[address],
+                            "count": count}
+                           for address, count in self.by_address.most_common()],
+        }, indent=2)
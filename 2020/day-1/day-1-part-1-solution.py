@@ -1,4 +1,63 @@
 # --- Day 1: Report Repair ---
+import itertools
+import math
+
+
+def find_entries_with_sum(entries : list, target : int, k : int) -> tuple:
+    """Finds `k` entries (at different positions in `entries`) which add up to the
+    `target`, and returns them, or None if there are none.
+
+    For k = 2, each entry is looked up in a hash set of the complements of the entries
+    before it, in O(n). For k = 3, each entry is fixed in turn while two pointers
+    close in on the rest of the sorted entries, in O(n^2) (but usually far less,
+    since no larger entries are tried once the sums are too large). For k >= 4,
+    the sums of every combination of k // 2 entries are indexed in a hash map, and
+    looked up for the complement of each combination of the other k - k // 2 entries
+    (meet in the middle), in O(n^(k - k // 2)).
+    """
+    if k == 1:
+        return (target,) if target in entries else None
+
+    if k == 2:
+        complements = set()
+        for entry in entries:
+            if target - entry in complements:
+                return target - entry, entry
+            complements.add(entry)
+        return None
+
+    if k == 3:
+        sorted_entries = sorted(entries)
+        n_entries = len(sorted_entries)
+        for idx_1 in range(n_entries - 2):
+            entry_1 = sorted_entries[idx_1]
+            if 3 * entry_1 > target:
+                break  # any three of the remaining entries add up to more than the target
+            idx_2, idx_3 = idx_1 + 1, n_entries - 1
+            while idx_2 < idx_3:
+                total = entry_1 + sorted_entries[idx_2] + sorted_entries[idx_3]
+                if total == target:
+                    return entry_1, sorted_entries[idx_2], sorted_entries[idx_3]
+                elif total < target:
+                    idx_2 += 1
+                else:
+                    idx_3 -= 1
+        return None
+
+    # meet in the middle: index the sums of the combinations of half of the entries
+    half_size = k // 2
+    combinations_by_sum = {}
+    for combination in itertools.combinations(range(len(entries)), half_size):
+        combination_sum = sum(entries[idx] for idx in combination)
+        combinations_by_sum.setdefault(combination_sum, []).append(combination)
+
+    for other_combination in itertools.combinations(range(len(entries)), k - half_size):
+        complement = target - sum(entries[idx] for idx in other_combination)
+        for combination in combinations_by_sum.get(complement, ()):
+            # the two halves must not use the same entry twice
+            if set(combination).isdisjoint(other_combination):
+                return tuple(entries[idx] for idx in combination + other_combination)
+    return None
 
 
 with open("input", "r") as input_data:
@@ -8,9 +67,9 @@ with open("input", "r") as input_data:
     # convert to integers
     expense_report_entries = [int(i) for i in expense_report_entries]
 
-for idx_1, entry_1 in enumerate(expense_report_entries):
-    for idx_2, entry_2 in enumerate(expense_report_entries[idx_1 + 1:]):
-        if entry_1 + entry_2 == 2020:
-            product = entry_1 * entry_2
-            print("Answer:", product)
-            exit(0)
\ No newline at end of file
+# find the two entries that sum to 2020
+entries = find_entries_with_sum(entries=expense_report_entries, target=2020, k=2)
+
+# the answer to the puzzle is the product of those entries
+product = math.prod(entries)
+print("Answer:", product)
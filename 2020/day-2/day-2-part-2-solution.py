@@ -1,33 +1,66 @@
 # --- Day 2: Password Philosophy ---
+from typing import Iterator, Tuple
+import re
+import numpy as np
 
+# the size (in bytes) of the chunks in which the input is read, so that the memory
+# used stays the same however long the input is
+CHUNK_SIZE = 2 ** 24
 
-with open("input", "r") as input_data:
-    # read entries; each entry is a separate line in input
-    policies_and_passwords = input_data.read().split("\n")[:-1]  # remove the last entry, just a blank due to the last \n
+# each entry is e.g. "1-3 a: abcde"
+ENTRY_PATTERN = re.compile(rb"(\d+)-(\d+) (\S): (\S*)")
 
-    # preprocess the data a bit
-    policy_rules = []
-    policy_letters = []
-    passwords = []
-    for entry in policies_and_passwords:
-        # split each entry into the three components
-        rule, letter, pwd = entry.split(" ")
 
-        policy_rules.append(rule)
-        policy_letters.append(letter[:-1])
-        passwords.append(pwd)
+def parse_policies_and_passwords(text : bytes) -> Tuple[np.ndarray, ...]:
+    """Parses entries into columns: the two numbers and the letter (as its character
+    code) of each policy, all the passwords joined into a single buffer of character
+    codes, and the offset and length of each password in that buffer.
+    """
+    entries = ENTRY_PATTERN.findall(text)
+    numbers_1 = np.array([entry[0] for entry in entries], dtype=np.int64)
+    numbers_2 = np.array([entry[1] for entry in entries], dtype=np.int64)
+    letters = np.frombuffer(b"".join(entry[2] for entry in entries), dtype=np.uint8)
+    passwords = [entry[3] for entry in entries]
+    buffer = np.frombuffer(b"".join(passwords), dtype=np.uint8)
+    lengths = np.fromiter(map(len, passwords), dtype=np.int64, count=len(passwords))
+    offsets = np.cumsum(lengths) - lengths
+    return numbers_1, numbers_2, letters, buffer, offsets, lengths
 
-# loop over passwords
-n_valid_passwords = 0
-for idx, pwd in enumerate(passwords):
-    # get the policy requirements for this password
-    rule_min, rule_max = policy_rules[idx].split("-")
-    letter = policy_letters[idx]
+
+def read_policies_and_passwords(path : str, chunk_size : int=CHUNK_SIZE) -> Iterator[tuple]:
+    """Reads the entries in chunks of about `chunk_size` bytes, and parses each chunk
+    into columns (see `parse_policies_and_passwords`).
+    """
+    with open(path, "rb") as input_data:
+        remainder = b""
+        while chunk := input_data.read(chunk_size):
+            # a chunk may end in the middle of a line, which is kept for the next chunk
+            chunk = remainder + chunk
+            last_line_end = chunk.rfind(b"\n") + 1
+            remainder = chunk[last_line_end:]
+            if last_line_end:
+                yield parse_policies_and_passwords(chunk[:last_line_end])
+        if remainder.strip():
+            yield parse_policies_and_passwords(remainder)
+
+
+def count_valid_passwords(position_1 : np.ndarray, position_2 : np.ndarray, letters : np.ndarray,
+                          buffer : np.ndarray, offsets : np.ndarray, lengths : np.ndarray) -> int:
+    """Counts the passwords which have their policy letter at exactly one of the two
+    (1-indexed) positions, for a whole chunk of passwords at once.
+    """
+    def _has_letter_at(position : np.ndarray) -> np.ndarray:
+        # positions beyond the end of a password never hold its letter
+        in_password = (1 <= position) & (position <= lengths)
+        indices = np.where(in_password, offsets + position - 1, 0)
+        return in_password & (buffer[indices] == letters) if len(buffer) else in_password
 
     # check if password satisfies requirement
-    if pwd[int(rule_min) - 1] == letter and pwd[int(rule_max) - 1] == letter:
-        pass
-    elif pwd[int(rule_min) - 1] == letter or pwd[int(rule_max) - 1] == letter:
-        n_valid_passwords +=1
+    return int((_has_letter_at(position_1) ^ _has_letter_at(position_2)).sum())
+
+
+# loop over passwords, a chunk of the input at a time
+n_valid_passwords = sum(count_valid_passwords(*columns)
+                        for columns in read_policies_and_passwords(path="input"))
 
 print("Answer:", n_valid_passwords)
\ No newline at end of file
@@ -1,28 +1,28 @@
 # --- 3: Toboggan Trajectory ---
-
-
-def traverse_map(tree_map, steps_right, steps_down):
-    n_trees_encountered = 0
-    n_right_steps = 0
-    line_idx = 0
-    while line_idx < len(tree_map):
-
-        # get the current line in the tree map
-        line =tree_map[line_idx]
-
-        # get the idx for the square where currently standing
-        idx = n_right_steps % len(line)  # correct by 1 because it is an index
-    
-        # get the square that this corresponds to on the line, if contains a tree, add 1
-        map_square = line[idx]
-        n_trees_encountered += map_square.count("#")
-        
-        # shift over `steps_right`
-        n_right_steps += steps_right
-
-        # shift down `steps_down`
-        line_idx += steps_down
-    
+import math
+import numpy as np
+
+
+def get_tree_map(lines : list) -> np.ndarray:
+    """Converts the lines of the map into a boolean array, which is True where there
+    is a tree.
+    """
+    return np.array([list(line) for line in lines]) == "#"
+
+
+def count_trees(tree_map : np.ndarray, slopes : list) -> np.ndarray:
+    """Counts the trees encountered on the way down the map for each slope, given as
+    (steps right, steps down). The squares visited along each slope are gathered from
+    the map all at once, with the map repeating to the right (i.e. the column index
+    wraps around).
+    """
+    height, width = tree_map.shape
+    n_trees_encountered = np.empty(len(slopes), dtype=np.int64)
+    for slope_idx, (steps_right, steps_down) in enumerate(slopes):
+        # shift down `steps_down` and over `steps_right` at each step
+        rows = np.arange(0, height, steps_down)
+        columns = (np.arange(len(rows)) * steps_right) % width
+        n_trees_encountered[slope_idx] = tree_map[rows, columns].sum()
     return n_trees_encountered
 
 
@@ -31,23 +31,18 @@ with open("input", "r") as input_data:
     # read entries; each entry is a separate line in input
     tree_map = input_data.read().split("\n")[:-1]  # remove the last entry, just a blank due to the last \n
 
+# convert the map once, for all the slopes
+tree_map = get_tree_map(lines=tree_map)
+
 # then compute the number of trees traversed for each case:
 # Right 1, down 1.
-case_1 = traverse_map(tree_map=tree_map, steps_right=1, steps_down=1)
-
 # Right 3, down 1.
-case_2 = traverse_map(tree_map=tree_map, steps_right=3, steps_down=1)
-
 # Right 5, down 1.
-case_3 = traverse_map(tree_map=tree_map, steps_right=5, steps_down=1)
-
 # Right 7, down 1.
-case_4 = traverse_map(tree_map=tree_map, steps_right=7, steps_down=1)
-
 # Right 1, down 2.
-case_5 = traverse_map(tree_map=tree_map, steps_right=1, steps_down=2)
+cases = count_trees(tree_map=tree_map, slopes=[(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)])
 
 # compute the product of the number of trees traversed in each case
-product = case_1 * case_2 * case_3 * case_4 * case_5
+product = math.prod(cases.tolist())  # in Python integers, which never overflow
 
 print("Answer:", product)
@@ -1,21 +1,31 @@
 # --- Day 4: Passport Processing ---
+from typing import Iterator
+import itertools
 
+# define the required fields
+REQUIRED_FIELDS = {"byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"}
 
-with open("input", "r") as input_data:
-    # read entries; each entry is a separate line in input
-    passports = input_data.read().split("\n\n")
 
-# define the required fields
-required_fields = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"]
+def read_passports(path : str) -> Iterator[dict]:
+    """Reads the passports one at a time (each passport is a record of "key:value"
+    fields, separated from the next by a blank line), and yields the fields of each
+    passport as a dict.
+    """
+    with open(path, "r") as input_data:
+        passport_lines = []
+        for line in itertools.chain(input_data, [""]):  # a last blank line ends the last passport
+            if line.strip():
+                passport_lines.append(line)
+            elif passport_lines:
+                # split the passport into its fields, and each field into key and value
+                yield dict(field.split(":", 1) for field in " ".join(passport_lines).split())
+                passport_lines = []
 
-# add ":" too all the required fields to search for them in each passport entry
-required_fields = [i + ":" for i in required_fields]
 
-# count the valid passports
+# count the valid passports, i.e. those which have all the required fields
 n_valid_passports = 0
-n_required_fields = len(required_fields)
-for passport_entry in passports:
-    if all(i in passport_entry for i in required_fields):
+for passport in read_passports(path="input"):
+    if REQUIRED_FIELDS <= passport.keys():
         n_valid_passports += 1
 
 print("Answer:", n_valid_passports)
\ No newline at end of file
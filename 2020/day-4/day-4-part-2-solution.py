@@ -1,65 +1,93 @@
 # --- Day 4: Passport Processing ---
+from typing import Callable, Iterator
+import itertools
 import re  # regular expressions
 
-
-with open("input", "r") as input_data:
-    # read entries; each entry is a separate line in input
-    passports = input_data.read().split("\n\n")
+# the rules for each field: a pattern which the whole value must match, and the
+# range which the number in the value must be in (for each unit, if any)
+PASSPORT_SCHEMA = {
+    # byr (Birth Year) - four digits; at least 1920 and at most 2002.
+    "byr": (r"(?P<number>\d{4})", {None: (1920, 2002)}),
+    # iyr (Issue Year) - four digits; at least 2010 and at most 2020.
+    "iyr": (r"(?P<number>\d{4})", {None: (2010, 2020)}),
+    # eyr (Expiration Year) - four digits; at least 2020 and at most 2030.
+    "eyr": (r"(?P<number>\d{4})", {None: (2020, 2030)}),
+    # hgt (Height) - a number followed by either cm or in:
+    # If cm, the number must be at least 150 and at most 193.
+    # If in, the number must be at least 59 and at most 76.
+    "hgt": (r"(?P<number>\d+)(?P<unit>cm|in)", {"cm": (150, 193), "in": (59, 76)}),
+    # hcl (Hair Color) - a # followed by exactly six characters 0-9 or a-f.
+    "hcl": (r"#[0-9a-f]{6}", None),
+    # ecl (Eye Color) - exactly one of: amb blu brn gry grn hzl oth.
+    "ecl": (r"amb|blu|brn|gry|grn|hzl|oth", None),
+    # pid (Passport ID) - a nine-digit number, including leading zeroes.
+    "pid": (r"\d{9}", None),
+    # cid (Country ID) - ignored, missing or not.
+    "cid": (r".*", None),
+}
 
 # define the required fields
-required_fields = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"]
+REQUIRED_FIELDS = {"byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"}
 
-# add ":" too all the required fields to search for them in each passport entry
-required_fields = [i + ":" for i in required_fields]
 
-# count the valid passports
-n_valid_passports = 0
-n_required_fields = len(required_fields)
-for passport_entry in passports:
-    if all(i in passport_entry for i in required_fields):
+def compile_schema(schema : dict) -> dict:
+    """Compiles the rules of each field into a function which checks if a value of
+    that field is valid, so that the patterns are only compiled once.
+    """
+    def _compile_rule(pattern : str, number_ranges : dict) -> Callable[[str], bool]:
+        compiled_pattern = re.compile(pattern)
+
+        def is_valid(value : str) -> bool:
+            match = compiled_pattern.fullmatch(value)
+            if match is None:
+                return False
+            if number_ranges is None:
+                return True
+            rule_min, rule_max = number_ranges[match.groupdict().get("unit")]
+            return rule_min <= int(match["number"]) <= rule_max
+
+        return is_valid
+
+    return {field: _compile_rule(pattern, number_ranges)
+            for field, (pattern, number_ranges) in schema.items()}
 
-        valid_passport = True  # assume True until at least one condition proves False
 
-        # loop over fields, check if condition is met for each field
-        for field in re.split(" |\n", passport_entry):
-            # byr (Birth Year) - four digits; at least 1920 and at most 2002.
-            if "byr:" in field:
-                valid_field = bool(1920 <= int(field[4:]) <= 2002)
-            # iyr (Issue Year) - four digits; at least 2010 and at most 2020.
-            elif "iyr:" in field:
-                valid_field = bool(2010 <= int(field[4:]) <= 2020)
-            # eyr (Expiration Year) - four digits; at least 2020 and at most 2030.
-            elif "eyr:" in field:
-                valid_field = bool(2020 <= int(field[4:]) <= 2030)
-            # hgt (Height) - a number followed by either cm or in:
-            # If cm, the number must be at least 150 and at most 193.
-            elif "hgt:" in field and "cm" in field:
-                valid_field = bool(150 <= int(field[4:-2]) <= 193)
-            # If in, the number must be at least 59 and at most 76.
-            elif "hgt:" in field and "in" in field:
-                valid_field = bool(59 <= int(field[4:-2]) <= 76)
-            # hcl (Hair Color) - a # followed by exactly six characters 0-9 or a-f.
-            elif "hcl:#" in field:
-                valid_field = bool(re.match("[0-9, a-z]{6}\s", field[5:] + " "))
-            # ecl (Eye Color) - exactly one of: amb blu brn gry grn hzl oth.
-            elif "ecl:" in field:
-                valid_field = bool(any(i in field for i in ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]))
-            # pid (Passport ID) - a nine-digit number, including leading zeroes.
-            elif "pid:" in field:
-                valid_field = bool(re.match("[0-9]{9}\s", field[4:] + " "))
-            # cid (Country ID) - ignored, missing or not.
-            elif "cid:" in field:
-                valid_field = True
-            # otherwise, this is an invalid field
-            else:
-                valid_field = False
+def is_passport_valid(passport : dict, validators : dict) -> bool:
+    """Checks if a passport has all the required fields, and if every one of its
+    fields is valid (a field which is not in the schema is invalid).
+    """
+    if not REQUIRED_FIELDS <= passport.keys():
+        return False
+    for field, value in passport.items():
+        validator = validators.get(field)
+        if validator is None or not validator(value):
+            return False
+    return True
 
-            if not valid_field:
-                valid_passport = False
-                break 
 
-        # if all conditions are met, we still have a valid passport
-        if valid_passport:
-            n_valid_passports += 1
+def read_passports(path : str) -> Iterator[dict]:
+    """Reads the passports one at a time (each passport is a record of "key:value"
+    fields, separated from the next by a blank line), and yields the fields of each
+    passport as a dict.
+    """
+    with open(path, "r") as input_data:
+        passport_lines = []
+        for line in itertools.chain(input_data, [""]):  # a last blank line ends the last passport
+            if line.strip():
+                passport_lines.append(line)
+            elif passport_lines:
+                # split the passport into its fields, and each field into key and value
+                yield dict(field.split(":", 1) for field in " ".join(passport_lines).split())
+                passport_lines = []
+
+
+# compile the rules once, for all the passports
+validators = compile_schema(schema=PASSPORT_SCHEMA)
+
+# count the valid passports
+n_valid_passports = 0
+for passport in read_passports(path="input"):
+    if is_passport_valid(passport=passport, validators=validators):
+        n_valid_passports += 1
 
 print("Answer:", n_valid_passports)
\ No newline at end of file